@@ -1,15 +1,28 @@
 from __future__ import annotations
 
-import html
 import json
 import re
+import sys
 from pathlib import Path
 
 import folium
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
-from folium.plugins import HeatMap, MarkerCluster
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
+from folium.plugins import FastMarkerCluster, HeatMap
+
+# `streamlit run dashboard/app.py` only puts dashboard/ on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.popups import popup_html
+
+try:
+    # Optional: orjson parses bracketed skill arrays several times faster
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 st.set_page_config(page_title="CHARM Dashboard", layout="wide")
 
@@ -20,6 +33,14 @@ GEO_DIR = BASE / "data" / "geo"
 DEFAULT_CENTER = [39.5, -98.35]
 DEFAULT_ZOOM = 4
 
+# Map regions as (south, north, west, east); None shows every posting
+REGION_BOUNDS = {
+    "All": None,
+    "Contiguous US": (24.4, 49.5, -125.0, -66.9),
+    "Alaska": (51.0, 71.5, -180.0, -129.0),
+    "Hawaii": (18.8, 22.4, -160.4, -154.7),
+}
+
 SENIORITY_COLORS = {
     "entry": "#4c78a8",
     "mid": "#72b7b2",
@@ -27,6 +48,45 @@ SENIORITY_COLORS = {
     "lead/PI": "#e45756",
 }
 
+# Compact dtypes for the cached frame: halves memory and speeds up filters/groupbys
+JOB_DTYPES = {
+    "lat": "float32",
+    "lon": "float32",
+    "salary_min": "float32",
+    "salary_max": "float32",
+    "state": "category",
+    "seniority": "category",
+    "job_type": "category",
+    "currency": "category",
+}
+
+# Columns read from jobs.parquet; the long `description` text is never loaded
+JOB_COLUMNS = [
+    "source", "title", "company", "location", "city", "state", "lat", "lon",
+    "date_posted", "job_type", "seniority", "skills", "skills_list", "salary_min", "salary_max",
+    "currency", "url", "sentiment", "popup_html",
+]
+
+# Above this many postings the points map draws one sized circle per grid cell
+# (POINT_GRID_DEG degrees square, coarsened until the cells fit) instead of markers
+MAX_POINT_MARKERS = 5000
+POINT_GRID_DEG = 0.25
+
+# Above this many points the heatmap is aggregated to weighted ~1 km grid cells
+MAX_HEATMAP_POINTS = 50000
+
+# Leaflet callback for FastMarkerCluster rows: [lat, lon, color, icon, popup_html]
+_POINT_MARKER_JS = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({
+        icon: row[3], prefix: "fa", markerColor: "lightgray", iconColor: row[2]
+    });
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[4], {maxWidth: 320});
+    return marker;
+};
+"""
+
 JOBTYPE_ICONS = {
     "field-tech": "wrench",
     "lab/analyst": "flask",
@@ -34,70 +94,161 @@ JOBTYPE_ICONS = {
     "pm/pi": "briefcase",
 }
 
-def _coerce_skills(value) -> list[str]:
-    """Safely parse skills from various formats without code execution risk."""
-    if isinstance(value, list):
-        return [str(v).strip() for v in value if str(v).strip()]
-    if isinstance(value, str):
-        raw = value.strip()
-        if not raw:
-            return []
-        # Try JSON parsing first (safe, no code execution)
-        if raw.startswith("[") and raw.endswith("]"):
-            try:
-                parsed = json.loads(raw)
-                if isinstance(parsed, list):
-                    return [str(v).strip() for v in parsed if str(v).strip()]
-            except (json.JSONDecodeError, TypeError):
-                pass
-        tokens = re.split(r"[;|,]", raw)
-        return [t.strip(" []'\"") for t in tokens if t.strip(" []'\"")]
-    return []
+_SKILL_SPLIT_RE = re.compile(r"[;|,]")
+_SKILL_STRIP_CHARS = " []'\""
+
+
+def _json_skill_list(raw: str) -> list[str] | None:
+    # JSON parsing only (safe, no code execution)
+    try:
+        parsed = _json_loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if not isinstance(parsed, list):
+        return None
+    return [str(v).strip() for v in parsed if str(v).strip()]
+
+
+def _coerce_skills_column(values: pd.Series) -> pd.Series:
+    """Parse a skills column (lists, JSON arrays, or delimited text) into lists of strings.
+
+    Delimited text is split for the whole column in one vectorized pass; only
+    bracketed values go through JSON parsing.
+    """
+    text = values.astype(object).where(values.map(type).eq(str)).str.strip()
+    tokens = text.str.split(_SKILL_SPLIT_RE).tolist()
+    bracketed = (text.str.startswith("[") & text.str.endswith("]")).fillna(False).tolist()
+
+    out = []
+    for raw, toks, is_json in zip(values.tolist(), tokens, bracketed):
+        if isinstance(raw, list):
+            out.append([str(v).strip() for v in raw if str(v).strip()])
+        elif is_json and (parsed := _json_skill_list(raw)) is not None:
+            out.append(parsed)
+        elif isinstance(toks, list):
+            out.append([t.strip(_SKILL_STRIP_CHARS) for t in toks if t.strip(_SKILL_STRIP_CHARS)])
+        else:
+            out.append([])
+    return pd.Series(out, index=values.index, dtype=object)
+
+
+def _read_jobs_file() -> pd.DataFrame | None:
+    pq_path = DATA_DIR / "jobs.parquet"
+    if pq_path.exists():
+        schema = pq.read_schema(pq_path)
+        columns = [c for c in JOB_COLUMNS if c in schema.names]
+        table = pq.read_table(pq_path, columns=columns)
+        if "skills_list" not in columns:
+            return table.to_pandas()
+        skills = table.column("skills_list")
+        df = table.drop_columns(["skills_list"]).to_pandas()
+        # Native list<string> converts straight to Python lists; older files
+        # stored JSON text there, which load_jobs re-derives from `skills`
+        if pa.types.is_list(skills.type) or pa.types.is_large_list(skills.type):
+            df["skills_list"] = pd.Series(
+                [lst or [] for lst in skills.to_pylist()], index=df.index, dtype=object
+            )
+        return df
+
+    # Older pipeline runs only wrote CSV; its JSON skills_list is re-derived from `skills`
+    fp = DATA_DIR / "jobs.csv"
+    if fp.exists():
+        return pd.read_csv(fp, usecols=lambda c: c != "skills_list")
+    return None
 
 
 @st.cache_data(show_spinner=False)
 def load_jobs() -> pd.DataFrame:
-    fp = DATA_DIR / "jobs.csv"
-    if not fp.exists():
+    df = _read_jobs_file()
+    if df is None:
         return pd.DataFrame()
 
-    df = pd.read_csv(fp)
     # Expected columns (degrade gracefully if some are missing)
     # id, title, company, url, city, state, lat, lon, date_posted, seniority, job_type, skills
     # skills: semicolon/pipe/comma-separated normalized skills
-    # dates to datetime
+    # dates to (naive, day-resolution) datetime64 so range filters stay vectorized
     if "date_posted" in df.columns:
-        df["date_posted"] = pd.to_datetime(df["date_posted"], errors="coerce", utc=True).dt.date
+        posted = pd.to_datetime(df["date_posted"], errors="coerce", utc=True)
+        df["date_posted"] = posted.dt.tz_localize(None).dt.normalize()
 
-    # ensure lat/lon numeric
-    for col in ("lat", "lon"):
+    # ensure lat/lon/salary numeric
+    for col in ("lat", "lon", "salary_min", "salary_max"):
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # basic cleanliness
     for col in ("title", "company", "state", "city", "seniority", "job_type"):
         if col in df.columns:
-            df[col] = df[col].fillna("").astype(str).str.strip()
+            df[col] = df[col].astype(object).fillna("").astype(str).str.strip()
 
-    # skills → list[str]
-    if "skills" in df.columns:
-        df["skills_list"] = df["skills"].apply(_coerce_skills)
-    else:
+    # skills → list[str] (jobs.parquet already provides native lists)
+    if "skills_list" not in df.columns and "skills" in df.columns:
+        df["skills_list"] = _coerce_skills_column(df["skills"])
+    elif "skills_list" not in df.columns:
         df["skills_list"] = [[] for _ in range(len(df))]
 
     # lightweight validity
     if {"lat", "lon"}.issubset(df.columns):
         df = df[df["lat"].between(-90, 90) & df["lon"].between(-180, 180)]
 
+    df = df.astype({c: t for c, t in JOB_DTYPES.items() if c in df.columns})
     return df.reset_index(drop=True)
 
 
 @st.cache_data(show_spinner=False)
-def load_us_states_geojson():
+def load_skills_long() -> pd.Series:
+    """One categorical skill per (job, skill) pair, indexed by the job's row in load_jobs()."""
+    jobs = load_jobs()
+    if "skills_list" not in jobs.columns:
+        return pd.Series([], dtype="category")
+    return jobs["skills_list"].explode().dropna().astype("category")
+
+
+def _skill_options(rows: pd.Index) -> list[str]:
+    """Sorted skills present in `rows` of load_jobs(), read from the cached long-form series."""
+    skills = load_skills_long()
+    present = skills[skills.index.isin(rows)]
+    return sorted(present.cat.remove_unused_categories().cat.categories)
+
+
+def _in_box(lat: np.ndarray, lon: np.ndarray, bounds: tuple[float, float, float, float]) -> np.ndarray:
+    """Vectorized boolean mask of points inside (south, north, west, east)."""
+    south, north, west, east = bounds
+    return (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+
+
+def _has_any_skill(df: pd.DataFrame, selected_skills: list[str]) -> pd.Series:
+    skills = load_skills_long()
+    hits = skills.index[skills.isin(selected_skills)]
+    return pd.Series(df.index.isin(hits), index=df.index)
+
+
+def _read_states_geoparquet():
+    # GeoParquet (optional, needs geopandas) parses far faster than large GeoJSON
+    fp = GEO_DIR / "us_states.parquet"
+    if not fp.exists():
+        return None
+    try:
+        import geopandas as gpd
+    except ImportError:
+        return None
+    return gpd.read_parquet(fp).__geo_interface__
+
+
+def _read_states_geojson():
     for name in ("us_states_simplified.geojson", "us_states.geojson"):
         fp = GEO_DIR / name
         if fp.exists():
-            data = json.loads(fp.read_text(encoding="utf-8"))
+            return json.loads(fp.read_bytes())
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def load_us_states_geojson():
+    # Shared, read-only reference: cache_data would deep-copy the polygons on every hit
+    for reader in (_read_states_geoparquet, _read_states_geojson):
+        data = reader()
+        if data is not None:
             # detect state code key
             code_key = None
             try:
@@ -124,13 +275,21 @@ def kpi_cards(df: pd.DataFrame):
         st.metric("Unique locations", f"{uniq_locs:,}")
 
 
+def _options(df: pd.DataFrame, col: str, mask: np.ndarray) -> list[str]:
+    if col not in df.columns:
+        return []
+    return sorted(s for s in df[col][mask].unique() if s)
+
+
 def sidebar_filters(df: pd.DataFrame):
     st.sidebar.header("Filters")
+    # Every filter ANDs into one mask; the frame is sliced once at the end
+    mask = np.ones(len(df), dtype=bool)
 
     # Date window
     if "date_posted" in df.columns and df["date_posted"].notna().any():
-        dmin = df["date_posted"].min()
-        dmax = df["date_posted"].max()
+        dmin = df["date_posted"].min().date()
+        dmax = df["date_posted"].max().date()
         start, end = st.sidebar.date_input(
             "Date range",
             value=(dmin, dmax),
@@ -139,25 +298,33 @@ def sidebar_filters(df: pd.DataFrame):
         if isinstance(start, tuple) or isinstance(end, tuple):
             # Streamlit guard: sometimes returns tuple on first render
             start, end = dmin, dmax
-        df = df[(df["date_posted"] >= start) & (df["date_posted"] <= end)]
+        mask &= df["date_posted"].between(pd.Timestamp(start), pd.Timestamp(end)).to_numpy()
 
     # Skill filter
-    all_skills = sorted({s for lst in df["skills_list"] for s in lst})
+    all_skills = _skill_options(df.index[mask])
     selected_skills = st.sidebar.multiselect("Skills", options=all_skills, default=[])
     if selected_skills:
-        df = df[df["skills_list"].apply(lambda lst: any(s in lst for s in selected_skills))]
+        mask &= _has_any_skill(df, selected_skills).to_numpy()
 
     # Seniority
-    seniority_opts = sorted([s for s in df["seniority"].unique() if s]) if "seniority" in df.columns else []
+    seniority_opts = _options(df, "seniority", mask)
     selected_sen = st.sidebar.multiselect("Seniority", options=seniority_opts, default=seniority_opts)
     if "seniority" in df.columns and selected_sen:
-        df = df[df["seniority"].isin(selected_sen)]
+        mask &= df["seniority"].isin(selected_sen).to_numpy()
 
     # Job type
-    jobtype_opts = sorted([s for s in df["job_type"].unique() if s]) if "job_type" in df.columns else []
+    jobtype_opts = _options(df, "job_type", mask)
     selected_jt = st.sidebar.multiselect("Job type", options=jobtype_opts, default=jobtype_opts)
     if "job_type" in df.columns and selected_jt:
-        df = df[df["job_type"].isin(selected_jt)]
+        mask &= df["job_type"].isin(selected_jt).to_numpy()
+
+    # Region: bounding-box filter applied before any map is built
+    region = st.sidebar.selectbox("Map region", options=list(REGION_BOUNDS), index=0)
+    bounds = REGION_BOUNDS[region]
+    if bounds is not None and {"lat", "lon"}.issubset(df.columns):
+        lat = df["lat"].to_numpy(dtype=np.float32, na_value=np.nan)
+        lon = df["lon"].to_numpy(dtype=np.float32, na_value=np.nan)
+        mask &= _in_box(lat, lon, bounds)
 
     # Map mode
     mode = st.sidebar.radio(
@@ -166,60 +333,83 @@ def sidebar_filters(df: pd.DataFrame):
         index=0
     )
 
-    return df, selected_skills, mode
+    return df[mask], selected_skills, mode, bounds
 
 
-def draw_points_map(df: pd.DataFrame):
-    m = folium.Map(location=DEFAULT_CENTER, zoom_start=DEFAULT_ZOOM, tiles="CartoDB positron")
-    cluster = MarkerCluster(name="Jobs").add_to(m)
-
-    # choose sensible defaults
-    has_url = "url" in df.columns
-    has_city_state = {"city", "state"}.issubset(df.columns)
-    has_seniority = "seniority" in df.columns
-    has_jobtype = "job_type" in df.columns
-
-    for _, r in df.iterrows():
-        if pd.isna(r.get("lat")) or pd.isna(r.get("lon")):
-            continue
-
-        color = SENIORITY_COLORS.get(str(r.get("seniority", "")).lower(), "#6c6c6c") if has_seniority else "#6c6c6c"
-        icon = JOBTYPE_ICONS.get(str(r.get("job_type", "")).lower(), "circle") if has_jobtype else "circle"
-
-        # Sanitize all user-controlled content to prevent XSS
-        title = html.escape(str(r.get("title", "")).strip())
-        company = html.escape(str(r.get("company", "")).strip())
-        city = html.escape(str(r.get("city", "")).strip()) if has_city_state else ""
-        state = html.escape(str(r.get("state", "")).strip()) if has_city_state else ""
-        loc_txt = f"{city}, {state}" if has_city_state else ""
-        skills = ", ".join(html.escape(s) for s in r.get("skills_list", [])[:5])
-
-        line1 = f"<b>{title}</b>" if title else ""
-        line2 = company if company else ""
-        line3 = loc_txt if loc_txt else ""
-        line4 = skills if skills else ""
-        url = str(r.get("url", "")).strip() if has_url else ""
-
-        # Validate URL scheme before including in HTML
-        links = ""
-        if has_url and url and url.startswith(("http://", "https://")):
-            safe_url = html.escape(url)
-            links = f'<br><a href="{safe_url}" target="_blank" rel="noopener noreferrer">Job posting</a>'
-        popup_html = "<br>".join([x for x in (line1, line2, line3, line4) if x]) + links
-
-        folium.Marker(
-            location=[r["lat"], r["lon"]],
-            icon=folium.Icon(color="lightgray", icon=icon, prefix="fa"),
-        ).add_to(cluster)
+def _text_col(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[col].astype(object).fillna("").astype(str).str.strip()
 
+
+def _popup_html(df: pd.DataFrame) -> pd.Series:
+    """Escaped popup HTML per row: precomputed by the pipeline in jobs.parquet, else built here."""
+    if "popup_html" in df.columns:
+        return df["popup_html"].astype(object).fillna("")
+    # CSV input from older pipeline runs
+    return popup_html(df)
+
+
+def _grid_cells(pts: pd.DataFrame, deg: float) -> pd.DataFrame:
+    """Aggregate points into `deg`-degree cells: mean position and posting count per cell."""
+    coords = pd.DataFrame({"lat": pts["lat"].astype(float), "lon": pts["lon"].astype(float)})
+    keys = np.floor(coords.to_numpy() / deg).astype(np.int32)
+    return (
+        coords.groupby([keys[:, 0], keys[:, 1]], sort=False)
+        .agg(lat=("lat", "mean"), lon=("lon", "mean"), count=("lat", "size"))
+        .reset_index(drop=True)
+    )
+
+
+def _draw_grid_cells(m: folium.Map, pts: pd.DataFrame) -> None:
+    deg = POINT_GRID_DEG
+    cells = _grid_cells(pts, deg)
+    while len(cells) > MAX_POINT_MARKERS:
+        deg *= 2
+        cells = _grid_cells(pts, deg)
+    st.caption(
+        f"{len(pts):,} postings aggregated into {len(cells):,} areas. "
+        "Narrow the filters to see individual postings."
+    )
+    group = folium.FeatureGroup(name="Jobs (aggregated)")
+    for lat, lon, count in cells.itertuples(index=False, name=None):
         folium.CircleMarker(
-            location=[r["lat"], r["lon"]],
-            radius=6,
-            color=color,
+            location=[lat, lon],
+            radius=float(4 + 2 * np.sqrt(count)),
+            tooltip=f"{count:,} postings",
+            color="#4c78a8",
+            weight=1,
             fill=True,
-            fill_opacity=0.85,
-            popup=folium.Popup(popup_html, max_width=320),
-        ).add_to(m)
+            fill_opacity=0.6,
+        ).add_to(group)
+    group.add_to(m)
+
+
+def draw_points_map(df: pd.DataFrame):
+    m = folium.Map(location=DEFAULT_CENTER, zoom_start=DEFAULT_ZOOM, tiles="CartoDB positron")
+    if not {"lat", "lon"}.issubset(df.columns):
+        return m
+
+    pts = df.dropna(subset=["lat", "lon"])
+    if len(pts) > MAX_POINT_MARKERS:
+        # Aggregate server-side so the browser never receives every marker and popup
+        _draw_grid_cells(m, pts)
+        folium.LayerControl(collapsed=True).add_to(m)
+        return m
+
+    # Markers are built in the browser from one JSON array: glyph color by seniority, icon by job type
+    rows = pd.DataFrame({
+        "lat": pts["lat"].astype(float),
+        "lon": pts["lon"].astype(float),
+        "color": _text_col(pts, "seniority").str.lower().map(SENIORITY_COLORS).fillna("#6c6c6c"),
+        "icon": _text_col(pts, "job_type").str.lower().map(JOBTYPE_ICONS).fillna("circle"),
+        "popup": _popup_html(pts),
+    })
+    FastMarkerCluster(
+        list(rows.itertuples(index=False, name=None)),
+        callback=_POINT_MARKER_JS,
+        name="Jobs",
+    ).add_to(m)
 
     folium.LayerControl(collapsed=True).add_to(m)
     return m
@@ -237,11 +427,11 @@ def draw_choropleth(df: pd.DataFrame, selected_skills: list[str]):
 
     # Aggregate counts by state; filter by skills if any were selected
     if selected_skills:
-        df = df[df["skills_list"].apply(lambda lst: any(s in lst for s in selected_skills))]
+        df = df[_has_any_skill(df, selected_skills)]
 
     tbl = (
         df.assign(state=df["state"].str.upper().str.strip())
-          .groupby("state", dropna=True)
+          .groupby("state", dropna=True, observed=True)
           .size()
           .reset_index(name="count")
     )
@@ -263,8 +453,8 @@ def draw_choropleth(df: pd.DataFrame, selected_skills: list[str]):
     # Simple tooltip
     def _state_map():
         d = {}
-        for _, r in tbl.iterrows():
-            d[str(r["state"]).upper()] = int(r["count"])
+        for state, count in tbl[["state", "count"]].itertuples(index=False, name=None):
+            d[str(state).upper()] = int(count)
         return d
     _state_map()  # Validate data but don't store unused result
 
@@ -298,15 +488,49 @@ def draw_heatmap(df: pd.DataFrame):
         return None
 
     m = folium.Map(location=DEFAULT_CENTER, zoom_start=5, tiles="CartoDB positron")
-    points = df[["lat", "lon"]].dropna().values.tolist()
-    if not points:
+    coords = df[["lat", "lon"]].dropna().to_numpy(dtype=np.float64)
+    if not len(coords):
         st.info("No points to render.")
         return None
 
+    if len(coords) > MAX_HEATMAP_POINTS:
+        # Collapse to grid cells weighted by posting count to bound the payload
+        cells, counts = np.unique(coords.round(2), axis=0, return_counts=True)
+        points = np.column_stack([cells, counts]).tolist()
+    else:
+        points = coords.round(5).tolist()
+
     HeatMap(points, radius=14, blur=18, max_zoom=6).add_to(m)
     return m
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_map_html(
+    _df: pd.DataFrame,
+    row_ids: tuple,
+    mode: str,
+    selected_skills: tuple[str, ...],
+    bounds: tuple[float, float, float, float] | None = None,
+) -> str | None:
+    """Build the Folium map for `mode` and return its standalone HTML.
+
+    `_df` is skipped by Streamlit's hasher: it is always a row subset of
+    load_jobs(), so `row_ids` (its index) identifies the content.
+    """
+    if mode == "Points (clustered)":
+        m = draw_points_map(_df)
+    elif mode == "Choropleth (by state)":
+        m = draw_choropleth(_df, list(selected_skills))
+    else:
+        m = draw_heatmap(_df)
+    if m is None:
+        return None
+    if bounds is not None:
+        south, north, west, east = bounds
+        m.fit_bounds([[south, west], [north, east]])
+    return m.get_root().render()
+
+
 def main():
     st.title("CHARM — Market Intelligence")
     df = load_jobs()
@@ -318,24 +542,25 @@ def main():
     kpi_cards(df)
     st.divider()
 
-    filtered, selected_skills, mode = sidebar_filters(df)
+    filtered, selected_skills, mode, bounds = sidebar_filters(df)
 
     tabs = st.tabs(["Map", "Tables"])
     with tabs[0]:
-        if mode == "Points (clustered)":
-            m = draw_points_map(filtered)
-        elif mode == "Choropleth (by state)":
-            m = draw_choropleth(filtered, selected_skills)
-        else:
-            m = draw_heatmap(filtered)
-
-        if m is not None:
-            st_folium(m, width=1100, height=640)
+        # Identical filters reuse the cached HTML instead of rebuilding the Folium map
+        map_html = render_map_html(
+            filtered, tuple(filtered.index), mode, tuple(sorted(selected_skills)), bounds
+        )
+        if map_html is not None:
+            components.html(map_html, width=1100, height=640)
 
     with tabs[1]:
         st.subheader("Filtered rows")
         show_cols = [c for c in ["date_posted","title","company","city","state","seniority","job_type","skills","url"] if c in filtered.columns]
-        st.dataframe(filtered[show_cols].reset_index(drop=True), use_container_width=True)
+        st.dataframe(
+            filtered[show_cols].reset_index(drop=True),
+            use_container_width=True,
+            column_config={"date_posted": st.column_config.DateColumn("date_posted")},
+        )
         st.download_button(
             "Download filtered CSV",
             filtered.to_csv(index=False).encode("utf-8"),
@@ -1,9 +1,9 @@
-import itertools
 import json
 import logging
 import os
 import random
 from collections import Counter
+from pathlib import Path
 
 import pandas as pd
 from wordcloud import WordCloud
@@ -13,33 +13,71 @@ logger = logging.getLogger(__name__)
 # Schema version for tracking output format changes
 SCHEMA_VERSION = "1.0"
 
+CLUSTER_CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "cache" / "clustering"
+
 # Determinism: seed for reproducible results
 def _get_seed() -> int:
     """Get seed from environment or use default for reproducibility."""
     return int(os.getenv("CHARM_SEED", "42"))
 
 
+def _parse_skill_text(entry: str) -> list[str] | None:
+    """Skills from a JSON array or ";"-separated string; None for a blank string."""
+    entry = entry.strip()
+    if not entry:
+        return None
+    if entry.startswith("["):
+        try:
+            parsed = json.loads(entry)
+            if isinstance(parsed, list):
+                return [str(v) for v in parsed]
+        except Exception:
+            pass
+    return [token.strip() for token in entry.split(";") if token.strip()]
+
+
 def _ensure_skill_lists(series: pd.Series):
     lists = []
-    for entry in series.dropna():
+    # Jobs share a small set of skill strings: parse each distinct one once
+    parsed: dict[str, list[str] | None] = {}
+    for entry in series.dropna().tolist():
         if isinstance(entry, list):
             lists.append(entry)
         elif isinstance(entry, str):
-            entry = entry.strip()
-            if not entry:
-                continue
-            if entry.startswith("["):
-                try:
-                    parsed = json.loads(entry)
-                    if isinstance(parsed, list):
-                        lists.append([str(v) for v in parsed])
-                        continue
-                except Exception:
-                    pass
-            lists.append([token.strip() for token in entry.split(";") if token.strip()])
+            if entry not in parsed:
+                parsed[entry] = _parse_skill_text(entry)
+            tokens = parsed[entry]
+            if tokens is not None:
+                lists.append(list(tokens))
     return lists
 
 
+def _cluster_labels(descriptions: list[str], seed: int):
+    """Cluster descriptions with hashed TF-IDF features and mini-batch k-means.
+
+    Hashing avoids building a vocabulary, and the result is memoized on disk by
+    joblib so reruns over the same descriptions skip the fit.
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import make_pipeline
+
+    pipe = make_pipeline(
+        HashingVectorizer(n_features=2**18, ngram_range=(1, 2), alternate_sign=False),
+        TfidfTransformer(),
+        MiniBatchKMeans(n_clusters=3, batch_size=1024, n_init=3, random_state=seed),
+    )
+    return pipe.fit_predict(descriptions)
+
+
+def _top_counts(values: pd.Series, n: int) -> list[tuple[str, int]]:
+    """Most common non-empty values, ties in first-seen order (like Counter.most_common)."""
+    values = values.dropna()
+    values = values[values != ""]
+    counts = values.value_counts(sort=False).sort_values(ascending=False, kind="stable")
+    return [(key, int(count)) for key, count in counts.head(n).items()]
+
+
 def analyze_market(jobs_df: pd.DataFrame, reports_df: pd.DataFrame | None) -> pd.Series:
     """Analyze job market data and return summary statistics.
 
@@ -62,27 +100,22 @@ def analyze_market(jobs_df: pd.DataFrame, reports_df: pd.DataFrame | None) -> pd
     if not jobs_df.empty:
         if "company" in jobs_df.columns:
             out["unique_employers"] = int(jobs_df["company"].nunique())
-            top_employers = Counter(
-                [c.strip() for c in jobs_df["company"].fillna("").tolist() if c.strip()]
-            ).most_common(20)
-            out["top_employers"] = top_employers
+            companies: pd.Series = jobs_df["company"].fillna("").astype(str)
+            out["top_employers"] = _top_counts(companies.str.strip(), 20)
         if "skills" in jobs_df.columns:
             skills_series = _ensure_skill_lists(jobs_df["skills"])
             if skills_series:
-                all_sk = list(itertools.chain.from_iterable(skills_series))
-                out["top_skills"] = Counter(all_sk).most_common(30)
+                out["top_skills"] = _top_counts(pd.Series(skills_series, dtype=object).explode(), 30)
         if {"lat", "lon"}.issubset(jobs_df.columns):
             out["geocoded"] = int(jobs_df[["lat", "lon"]].dropna().shape[0])
 
         if os.getenv("USE_CLUSTERING", "false").lower() == "true":
             try:
-                from sklearn.cluster import KMeans
-                from sklearn.feature_extraction.text import TfidfVectorizer
+                from joblib import Memory
 
-                vec = TfidfVectorizer(max_features=2000, ngram_range=(1, 2), min_df=2)
-                X = vec.fit_transform(jobs_df["description"].fillna(""))
-                km = KMeans(n_clusters=3, n_init=10, random_state=42)
-                labels = km.fit_predict(X)
+                memory = Memory(CLUSTER_CACHE_DIR, verbose=0)
+                descriptions = jobs_df["description"].fillna("").astype(str).tolist()
+                labels = memory.cache(_cluster_labels)(descriptions, _get_seed())
                 out["cluster_counts"] = Counter(labels)
             except ImportError:
                 logger.warning("scikit-learn not installed; skipping clustering")
@@ -90,8 +123,7 @@ def analyze_market(jobs_df: pd.DataFrame, reports_df: pd.DataFrame | None) -> pd
                 out["cluster_error"] = str(exc)
 
     if reports_df is not None and not reports_df.empty and "skills" in reports_df.columns:
-        rep_sk = list(itertools.chain.from_iterable(reports_df["skills"].dropna().tolist()))
-        out["report_skills"] = Counter(rep_sk).most_common(30)
+        out["report_skills"] = _top_counts(reports_df["skills"].dropna().explode(), 30)
 
     return pd.Series(out)
 
@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import json
 import re
@@ -6,10 +7,20 @@ from pathlib import Path
 
 import pandas as pd
 
+try:
+    # Optional: scans every bucket pattern in one pass per text
+    import hyperscan
+
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# Every match must begin at "$", "USD" or a digit: a leading optional `\s*` made the
+# engine rescan whitespace runs from every offset (quadratic on padded HTML text)
 _SAL_RE = re.compile(
-    r"(\$|USD\s*)?\s*(\d{2,3}(?:[,\.]\d{3})?)"
-    r"(?:\s*(?:-|–|to)\s*(?:\$|USD\s*)?\s*(\d{2,3}(?:[,\.]\d{3})?))?"
-    r"\s*(?:per\s*(year|yr|hour|hr|annum))?",
+    r"(?:(?P<cur>\$|USD)\s*)?(?P<low>\d{2,3}(?:[,.]\d{3})?)"
+    r"(?:\s*(?:-|–|to)\s*(?:\$|USD)?\s*(?P<high>\d{2,3}(?:[,.]\d{3})?))?"
+    r"(?:\s*per\s*(?P<period>year|yr|hour|hr|annum))?",
     re.I,
 )
 
@@ -68,8 +79,14 @@ US_STATE_MAP = {
 }
 STATE_NAME_TO_ABBR = {name.lower(): abbr for abbr, name in US_STATE_MAP.items()}
 
-_JOB_PATTERNS: dict[str, re.Pattern[str]] | None = None
+CATEGORICAL_COLUMNS = ("state", "job_type", "seniority", "currency")
+
+_WS_RE = re.compile(r"\s+")
+_LOC_SPLIT_RE = re.compile(r"[,\-/;|]")
+
+_JOB_PATTERNS: list[tuple[str, re.Pattern[str]]] | None = None
 _SENIORITY_PATTERNS: list[tuple[str, re.Pattern[str]]] | None = None
+_NEVER_MATCH = r"(?!x)"
 
 
 def _compile_entries(entries: Sequence[object]) -> re.Pattern[str]:
@@ -81,10 +98,11 @@ def _compile_entries(entries: Sequence[object]) -> re.Pattern[str]:
         if not pattern:
             raise ValueError("Each job pattern entry must include a 'pattern'.")
         compiled.append(f"(?:{pattern})")
-    return re.compile("|".join(compiled), re.I) if compiled else re.compile(r"(?!x)")
+    return re.compile("|".join(compiled), re.I) if compiled else re.compile(_NEVER_MATCH)
 
 
-def _load_patterns() -> tuple[dict[str, re.Pattern[str]], list[tuple[str, re.Pattern[str]]]]:
+def _load_patterns() -> tuple[list[tuple[str, re.Pattern[str]]], list[tuple[str, re.Pattern[str]]]]:
+    """Compile config/job_patterns.json once: one alternation regex per bucket, in config order."""
     global _JOB_PATTERNS, _SENIORITY_PATTERNS
     if _JOB_PATTERNS is not None and _SENIORITY_PATTERNS is not None:
         return _JOB_PATTERNS, _SENIORITY_PATTERNS
@@ -98,10 +116,10 @@ def _load_patterns() -> tuple[dict[str, re.Pattern[str]], list[tuple[str, re.Pat
     except json.JSONDecodeError as exc:
         raise ValueError(f"Invalid JSON in {config_path}") from exc
 
-    job_patterns = {
-        str(bucket): _compile_entries(entries)
+    job_patterns = [
+        (str(bucket), _compile_entries(entries))
         for bucket, entries in data.get("job_type", {}).items()
-    }
+    ]
     seniority_patterns = [
         (str(bucket), _compile_entries(entries))
         for bucket, entries in data.get("seniority", {}).items()
@@ -116,9 +134,9 @@ def extract_salary(text: str) -> tuple[float | None, float | None, str | None]:
     if not m:
         return None, None, None
 
-    cur = "USD" if m.group(1) else None
-    low_str = m.group(2).replace(",", "")
-    high_str = m.group(3).replace(",", "") if m.group(3) else None
+    cur = "USD" if m.group("cur") else None
+    low_str = m.group("low").replace(",", "")
+    high_str = m.group("high").replace(",", "") if m.group("high") else None
 
     try:
         low = float(low_str)
@@ -127,15 +145,44 @@ def extract_salary(text: str) -> tuple[float | None, float | None, str | None]:
         return None, None, None
     return low, high, cur
 
+def _extract_salaries(text: pd.Series) -> pd.DataFrame:
+    """Vectorized `extract_salary` over a text column (NaN where nothing matched)."""
+    ext = text.str.extract(_SAL_RE)
+    salaries: pd.DataFrame = pd.DataFrame({
+        "salary_min": pd.to_numeric(ext["low"].str.replace(",", "", regex=False), errors="coerce"),
+        "salary_max": pd.to_numeric(ext["high"].str.replace(",", "", regex=False), errors="coerce"),
+        "currency": ext["cur"].where(ext["cur"].isna(), "USD"),
+    }, index=text.index)
+    return salaries
+
+def _row_key(title, company, description):
+    return f"{(title or '').strip().lower()}|{(company or '').strip().lower()}|{(description or '')[:280].strip().lower()}"
+
 def _hash_row(title, company, description):
-    s = f"{(title or '').strip().lower()}|{(company or '').strip().lower()}|{(description or '')[:280].strip().lower()}"
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+    # Equality key only, never persisted: 128-bit BLAKE2b is plenty
+    return hashlib.blake2b(_row_key(title, company, description).encode("utf-8"), digest_size=16).hexdigest()
+
+def _dedupe_keys(df: pd.DataFrame) -> pd.Series:
+    """Normalized `_hash_row` keys (before hashing) over the title/company/description columns.
 
+    Duplicates are found on the key strings themselves: pandas' hashtable compares them
+    exactly, so no per-row digest is needed and there is no collision risk.
+    """
+    # One fused pass over plain lists rather than chained .str ops, each of which
+    # allocates a new column
+    keys: pd.Series = pd.Series(
+        list(map(_row_key, df["title"].tolist(), df["company"].tolist(), df["description"].tolist())),
+        index=df.index,
+        dtype=object,
+    )
+    return keys
+
+@functools.lru_cache(maxsize=8192)
 def _parse_city_state(loc: str) -> tuple[str, str]:
     if not loc:
         return "", ""
-    cleaned = re.sub(r"\s+", " ", loc)
-    parts = [p.strip() for p in re.split(r"[,\-/;|]", cleaned) if p.strip()]
+    cleaned = _WS_RE.sub(" ", loc)
+    parts = [p.strip() for p in _LOC_SPLIT_RE.split(cleaned) if p.strip()]
     city = parts[0] if parts else cleaned.strip()
     state = ""
     for token in parts[1:]:
@@ -149,55 +196,129 @@ def _parse_city_state(loc: str) -> tuple[str, str]:
             break
     return city, state
 
-def _infer_job_type(title: str, description: str) -> str:
-    job_patterns, _ = _load_patterns()
-    text = f"{title or ''} {description or ''}"
-    for bucket, pattern in job_patterns.items():
+def _parse_city_states(locations: pd.Series) -> pd.DataFrame:
+    """`_parse_city_state` over a location column, parsing each distinct location once."""
+    unique = locations.drop_duplicates()
+    parsed = list(map(_parse_city_state, unique))
+    # One dict per output column: two hash-map lookups instead of mapping to tuples and
+    # unpacking them with .str[0] / .str[1], which walks every row in Python
+    cities = dict(zip(unique, (city for city, _ in parsed)))
+    states = dict(zip(unique, (state for _, state in parsed)))
+    places: pd.DataFrame = pd.DataFrame(
+        {"city": locations.map(cities), "state": locations.map(states)}, index=locations.index
+    )
+    return places
+
+
+class _HyperscanLabeler:
+    """All job-type and seniority bucket regexes in one Hyperscan block-mode database.
+
+    One scan reports which buckets match anywhere in the text; the first matching
+    bucket in config order wins, exactly like `_first_bucket`. Hyperscan's word boundaries
+    and caseless matching are ASCII-only, so callers route non-ASCII text to `re`.
+    """
+
+    def __init__(self, job_patterns, seniority_patterns):
+        self.job_buckets = [bucket for bucket, _ in job_patterns]
+        self.seniority_buckets = [bucket for bucket, _ in seniority_patterns]
+        self.offset = len(job_patterns)
+        entries = [
+            (i, pattern.pattern.encode("utf-8"))
+            for i, (_, pattern) in enumerate([*job_patterns, *seniority_patterns])
+            if pattern.pattern != _NEVER_MATCH
+        ]
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        self.db = hyperscan.Database()
+        self.db.compile(
+            expressions=[expr for _, expr in entries],
+            ids=[i for i, _ in entries],
+            elements=len(entries),
+            flags=[flags] * len(entries),
+        )
+
+    def labels(self, text: str) -> tuple[str, str]:
+        hits = set()
+        self.db.scan(text.encode("ascii"), match_event_handler=lambda i, *_: hits.add(i))
+        job = next((b for i, b in enumerate(self.job_buckets) if i in hits), "")
+        seniority = next(
+            (b for i, b in enumerate(self.seniority_buckets, self.offset) if i in hits), ""
+        )
+        return job, seniority
+
+
+@functools.lru_cache(maxsize=1)
+def _hyperscan_labeler() -> "_HyperscanLabeler | None":
+    """Build the Hyperscan labeler once; None if unavailable or a pattern is unsupported."""
+    if not HAS_HYPERSCAN:
+        return None
+    job_patterns, seniority_patterns = _load_patterns()
+    try:
+        return _HyperscanLabeler(job_patterns, seniority_patterns)
+    except hyperscan.error:
+        # e.g. lookbehind or backreferences: stay on the `re` path
+        return None
+
+
+def _first_bucket(text: str, patterns: Sequence[tuple[str, re.Pattern[str]]]) -> str:
+    for bucket, pattern in patterns:
         if pattern.search(text):
             return bucket
     return ""
 
+def _text_labels(text: str) -> tuple[str, str]:
+    """(job_type, seniority) for a title + description text."""
+    labeler = _hyperscan_labeler() if text.isascii() else None
+    if labeler is not None:
+        return labeler.labels(text)
+    job_patterns, seniority_patterns = _load_patterns()
+    return _first_bucket(text, job_patterns), _first_bucket(text, seniority_patterns)
+
+def _infer_job_type(title: str, description: str) -> str:
+    job_patterns, _ = _load_patterns()
+    return _first_bucket(f"{title or ''} {description or ''}", job_patterns)
+
 def _infer_seniority(title: str, description: str) -> str:
     _, seniority_patterns = _load_patterns()
-    text = f"{title or ''} {description or ''}"
-    for bucket, pattern in seniority_patterns:
-        if pattern.search(text):
-            return bucket
-    return ""
+    return _first_bucket(f"{title or ''} {description or ''}", seniority_patterns)
 
 def clean_and_dedupe(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
+    # Plain object strings on purpose: the key build, labeling and salary extraction below
+    # all work on Python str, which "string[pyarrow]" would convert back for every step
     for col in ["title", "company", "location", "date_posted", "job_url", "description"]:
         if col not in df.columns:
             df[col] = ""
         df[col] = df[col].fillna("").astype(str).str.strip()
 
-    df["dedupe_key"] = [_hash_row(r["title"], r["company"], r["description"]) for _, r in df.iterrows()]
-    df = df.drop_duplicates(subset=["job_url"]).drop_duplicates(subset=["dedupe_key"])
+    # One mask, one slice: first by URL, then by content key among the surviving rows.
+    # Content keys are only built for URL survivors, not for rows about to be dropped
+    keep = ~df["job_url"].duplicated().to_numpy()
+    keep[keep] = ~_dedupe_keys(df[keep]).duplicated().to_numpy()
+    df = df[keep]
 
-    salary_tuples = df["description"].fillna("").map(extract_salary).tolist()
-    if salary_tuples:
-        df["salary_min"], df["salary_max"], df["currency"] = zip(*salary_tuples)
-    else:
-        df["salary_min"] = []
-        df["salary_max"] = []
-        df["currency"] = []
+    # One regex scan of the description column fills all three salary fields
+    salaries = _extract_salaries(df["description"])
 
-    cities, states = zip(*[ _parse_city_state(loc) for loc in df["location"].tolist() ]) if len(df) else ([], [])
+    labels: dict[str, pd.Series]
     if len(df):
-        df["city"] = list(cities)
-        df["state"] = list(states)
-        df["job_type"] = [
-            _infer_job_type(row["title"], row["description"])
-            for _, row in df.iterrows()
-        ]
-        df["seniority"] = [
-            _infer_seniority(row["title"], row["description"])
-            for _, row in df.iterrows()
-        ]
-        df["url"] = df["job_url"]
+        places = _parse_city_states(df["location"])
+        # Build the match text column-wise, then label job type and seniority in one pass
+        texts = (df["title"] + " " + df["description"]).tolist()
+        job_types, seniorities = zip(*map(_text_labels, texts))
+        labels = {
+            "city": places["city"],
+            "state": places["state"],
+            "job_type": pd.Series(job_types, index=df.index, dtype=object),
+            "seniority": pd.Series(seniorities, index=df.index, dtype=object),
+        }
     else:
-        for col in ("city", "state", "job_type", "seniority", "url"):
-            df[col] = []
+        labels = {
+            col: pd.Series(index=df.index, dtype=object)
+            for col in ("city", "state", "job_type", "seniority")
+        }
+    # Every derived column lands in one assign on the deduped slice (no per-column setitem)
+    df = df.assign(**salaries, **labels, url=df["job_url"])
 
-    return df.drop(columns=["dedupe_key"])
+    # Low-cardinality labels as categoricals (smaller frames, faster groupby/value_counts)
+    df = df.astype(dict.fromkeys(CATEGORICAL_COLUMNS, "category"))
+    return df
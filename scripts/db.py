@@ -49,10 +49,19 @@ INDICES = [
     "CREATE INDEX IF NOT EXISTS idx_jobskills_jobid ON job_skills(job_id)"
 ]
 
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds (999)
+_SQL_VARS_PER_QUERY = 900
+
 def get_conn(db_path: Path):
     db_path.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(str(db_path))
     conn.execute("PRAGMA journal_mode=WAL;")
+    # WAL + NORMAL only fsyncs at checkpoints; a 64 MB page cache and mmap keep
+    # the job_url/skill indices hot during the bulk upserts
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")
+    conn.execute("PRAGMA mmap_size=268435456;")
     return conn
 
 def init_db(conn):
@@ -73,15 +82,26 @@ def _clean_record(value):
     return value
 
 
+def _records(df: pd.DataFrame, cols: list[str]) -> list[tuple]:
+    """Bind-ready row tuples; Series.tolist() already yields native Python scalars."""
+    columns = [df[c].tolist() for c in cols]
+    return [tuple(map(_clean_record, row)) for row in zip(*columns)]
+
+
 def upsert_jobs(conn, jobs_df: pd.DataFrame):
     cols = [
         "source", "title", "company", "location", "date_posted", "job_url",
         "description", "sentiment", "lat", "lon", "salary_min", "salary_max", "currency"
     ]
-    records = [
-        tuple(_clean_record(r[c]) for c in cols)
-        for _, r in jobs_df[cols].iterrows()
-    ]
+    records = _records(jobs_df, cols)
+    # Jobs and their skills land in one transaction (a single commit/fsync)
+    with conn:
+        _upsert_job_rows(conn, records)
+        if "skills" in jobs_df.columns:
+            _insert_job_skills(conn, jobs_df["job_url"].tolist(), jobs_df["skills"].tolist())
+
+
+def _upsert_job_rows(conn, records):
     if records:
         conn.executemany(
             """
@@ -105,39 +125,44 @@ def upsert_jobs(conn, jobs_df: pd.DataFrame):
             """,
             records
         )
-        conn.commit()
 
-    if "skills" not in jobs_df.columns:
-        return
 
-    cur = conn.cursor()
-    for _, r in jobs_df.iterrows():
-        url = r.get("job_url", "")
-        if not url:
-            continue
-        row = cur.execute("SELECT id FROM jobs WHERE job_url = ?", (url,)).fetchone()
-        if not row:
-            continue
-        job_id = row[0]
-        skills = r.get("skills") or []
-        if isinstance(skills, str):
-            skills = [s.strip() for s in skills.split(";") if s.strip()]
-        for s in skills:
-            cur.execute(
-                "INSERT OR IGNORE INTO job_skills (job_id, skill) VALUES (?, ?)",
-                (job_id, s)
-            )
-    conn.commit()
+def _skill_values(skills) -> list:
+    if isinstance(skills, list):
+        return skills
+    if isinstance(skills, str):
+        return [s.strip() for s in skills.split(";") if s.strip()]
+    return []
+
+
+def _job_ids(conn, urls: list[str]) -> dict[str, int]:
+    """Map job_url -> id with a handful of IN queries instead of one SELECT per job."""
+    ids = {}
+    for start in range(0, len(urls), _SQL_VARS_PER_QUERY):
+        chunk = urls[start:start + _SQL_VARS_PER_QUERY]
+        placeholders = ",".join("?" * len(chunk))
+        ids.update(conn.execute(
+            f"SELECT job_url, id FROM jobs WHERE job_url IN ({placeholders})", chunk
+        ).fetchall())
+    return ids
+
+
+def _insert_job_skills(conn, urls: list, skills: list):
+    url_to_id = _job_ids(conn, sorted({u for u in urls if isinstance(u, str) and u}))
+    pairs = [
+        (url_to_id[url], skill)
+        for url, job_skills in zip(urls, skills)
+        if url in url_to_id
+        for skill in _skill_values(job_skills)
+    ]
+    conn.executemany("INSERT OR IGNORE INTO job_skills (job_id, skill) VALUES (?, ?)", pairs)
 
 def upsert_reports(conn, reports_df: pd.DataFrame):
     if reports_df is None or reports_df.empty:
         return
 
     cols = ["report_name", "text", "word_count", "top_entities"]
-    records = [
-        tuple(_clean_record(r.get(c)) for c in cols)
-        for _, r in reports_df[cols].iterrows()
-    ]
+    records = _records(reports_df, cols)
     if records:
         conn.executemany(
             """
@@ -28,10 +28,37 @@ def _load_cache(path: Path) -> pd.DataFrame:
         return pd.DataFrame(columns=["location", "lat", "lon"])
 
 
+def _load_gazetteer(path: Path) -> dict[tuple[str, str], tuple[float, float]]:
+    """Optional offline US city table (city, state, lat, lon) keyed by (city lower, state upper)."""
+    if not path.exists():
+        return {}
+    try:
+        df = pd.read_csv(path, usecols=["city", "state", "lat", "lon"]).dropna()
+    except (pd.errors.EmptyDataError, OSError, ValueError):
+        return {}
+    keys = zip(df["city"].astype(str).str.strip().str.lower(), df["state"].astype(str).str.strip().str.upper())
+    return dict(zip(keys, zip(df["lat"], df["lon"])))
+
+
+def _resolve_offline(df: pd.DataFrame, pending: list[str], gazetteer: dict) -> dict:
+    """Coordinates for pending locations whose parsed (city, state) is in the gazetteer."""
+    if not gazetteer or not pending or not {"city", "state"}.issubset(df.columns):
+        return {}
+    places = df.drop_duplicates("location_norm").set_index("location_norm").loc[pending]
+    cities = places["city"].astype(object).fillna("").astype(str).str.strip().str.lower()
+    states = places["state"].astype(object).fillna("").astype(str).str.strip().str.upper()
+    found = {}
+    for loc, key in zip(places.index, zip(cities, states)):
+        if key in gazetteer:
+            found[loc] = gazetteer[key]
+    return found
+
+
 def geocode_locations(df: pd.DataFrame) -> pd.DataFrame:
     base = Path(__file__).resolve().parents[1]
     cache_path = base / "data" / "geocache.csv"
     cache = _load_cache(cache_path)
+    gazetteer = _load_gazetteer(base / "data" / "geo" / "us_cities.csv")
 
     contact = os.getenv("GEOCODE_CONTACT_EMAIL", "").strip()
     custom_agent = os.getenv("GEOCODE_USER_AGENT", "").strip()
@@ -41,12 +68,18 @@ def geocode_locations(df: pd.DataFrame) -> pd.DataFrame:
     geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1, swallow_exceptions=True)
 
     df = df.copy()
-    df["location_norm"] = df["location"].fillna("").astype(str).str.strip()
+    # Collapse whitespace so "Tucson,  AZ" and "Tucson, AZ" share one query and cache entry
+    locations: pd.Series = df["location"].fillna("").astype(str)
+    df["location_norm"] = locations.str.replace(r"\s+", " ", regex=True).str.strip()
 
-    known = {row["location"]: (row["lat"], row["lon"]) for _, row in cache.iterrows()}
+    known = dict(zip(cache["location"], zip(cache["lat"], cache["lon"])))
     new_entries = []
 
-    for loc in [loc for loc in df["location_norm"].unique() if loc and loc not in known]:
+    pending = [loc for loc in df["location_norm"].unique() if loc and loc not in known]
+    # Resolve what we can from the local city table; only the rest goes to Nominatim
+    known.update(_resolve_offline(df, pending, gazetteer))
+
+    for loc in [loc for loc in pending if loc not in known]:
         try:
             result = geocode(loc)
             lat = result.latitude if result else None
@@ -57,9 +90,18 @@ def geocode_locations(df: pd.DataFrame) -> pd.DataFrame:
         new_entries.append({"location": loc, "lat": lat, "lon": lon})
 
     if new_entries:
-        cache = pd.concat([cache, pd.DataFrame(new_entries)], ignore_index=True)
-        cache.to_csv(cache_path, index=False)
+        fresh = pd.DataFrame(new_entries)
+        if cache.empty:
+            # Missing, empty, or reset cache: write it from scratch
+            fresh.to_csv(cache_path, index=False)
+        else:
+            # Append only the new rows instead of rewriting the whole cache file
+            fresh.reindex(columns=cache.columns).to_csv(
+                cache_path, mode="a", header=False, index=False
+            )
 
-    df["lat"] = df["location_norm"].map(lambda loc: known.get(loc, (None, None))[0])
-    df["lon"] = df["location_norm"].map(lambda loc: known.get(loc, (None, None))[1])
+    # Broadcast the per-location results back to every posting in one lookup per column
+    coords = pd.DataFrame.from_dict(known, orient="index", columns=["lat", "lon"], dtype=float)
+    df["lat"] = df["location_norm"].map(coords["lat"])
+    df["lon"] = df["location_norm"].map(coords["lon"])
     return df.drop(columns=["location_norm"])
@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+import functools
 import os
 import re
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
+from gspread.utils import Dimension, ValueRenderOption, absolute_range_name
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 CACHE_DIR = BASE_DIR / "data" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+ID_CACHE_PATH = CACHE_DIR / "gsheets_ids.db"
+
+_WORKSHEETS: dict[tuple[str, str], gspread.Worksheet] = {}
+
+_SKILL_SEP_RE = re.compile(r"[;,|]")
+JOBS_HEADER = ["source", "title", "company", "location", "date_posted", "job_url", "skills", "lat", "lon", "sentiment"]
+REPORTS_HEADER = ["report_name", "word_count", "skills"]
+# Sheet column holding each cached id kind: job_url is JOBS_HEADER[5], report_name is first
+_ID_COLUMNS = {"job_url": "F", "report_name": "A"}
 
 
 def _authorize():
@@ -24,11 +37,21 @@ def _authorize():
     if not sa_path.is_file() or not str(sa_path).endswith(".json"):
         raise RuntimeError(f"Invalid service account file: {service_account}")
 
+    return _open_sheet(str(sa_path), sheet_id)
+
+
+@functools.lru_cache(maxsize=1)
+def _open_sheet(service_account: str, sheet_id: str):
+    """Authorized spreadsheet handle, reused until the configured account or sheet changes.
+
+    google-auth refreshes the access token on its own, so later syncs in the same
+    process skip the key load, JWT signing and token exchange.
+    """
     scopes = [
         "https://spreadsheets.google.com/feeds",
         "https://www.googleapis.com/auth/drive",
     ]
-    creds = Credentials.from_service_account_file(str(sa_path), scopes=scopes)
+    creds = Credentials.from_service_account_file(service_account, scopes=scopes)
     client = gspread.authorize(creds)
     return client.open_by_key(sheet_id)
 
@@ -42,7 +65,7 @@ def ensure_jobs_worksheet():
     ws = _get_or_create_ws(
         sheet,
         os.getenv("GOOGLE_SHEET_WORKSHEET", "jobs"),
-        ["source", "title", "company", "location", "date_posted", "job_url", "skills", "lat", "lon", "sentiment"],
+        JOBS_HEADER,
     )
     return sheet, ws
 
@@ -52,39 +75,114 @@ def ensure_reports_worksheet():
     ws = _get_or_create_ws(
         sheet,
         os.getenv("GOOGLE_SHEET_WORKSHEET_REPORTS", "reports"),
-        ["report_name", "word_count", "skills"],
+        REPORTS_HEADER,
         cols=10,
     )
     return sheet, ws
 
 
 def _get_or_create_ws(sheet, title: str, header: list[str], rows: int = 2000, cols: int = 20):
-    try:
-        return sheet.worksheet(title)
-    except gspread.WorksheetNotFound:
-        ws = sheet.add_worksheet(title=title, rows=str(rows), cols=str(cols))
-        ws.append_row(header)
-        return ws
+    # sheet.worksheet() fetches the spreadsheet metadata on every call
+    key = (sheet.id, title)
+    if key not in _WORKSHEETS:
+        try:
+            _WORKSHEETS[key] = sheet.worksheet(title)
+        except gspread.WorksheetNotFound:
+            ws = sheet.add_worksheet(title=title, rows=str(rows), cols=str(cols))
+            ws.append_row(header)
+            _WORKSHEETS[key] = ws
+    return _WORKSHEETS[key]
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_skill_text(value: str) -> str:
+    # Postings share a small set of skill strings, so most rows are cache hits
+    return ",".join(s.strip() for s in _SKILL_SEP_RE.split(value) if s.strip())
 
 
 def _normalize_skills(value) -> str:
     if isinstance(value, list):
-        entries = value
-    elif isinstance(value, str):
-        entries = [s.strip() for s in re.split(r"[;,|]", value) if s.strip()]
-    else:
-        entries = []
-    return ",".join(entries)
+        return ",".join(value)
+    if isinstance(value, str):
+        return _normalize_skill_text(value)
+    return ""
+
+
+def _sheet_values(df: pd.DataFrame, col: str) -> list:
+    """Column as native Python values with blanks for missing cells (JSON-safe for gspread)."""
+    if col not in df.columns:
+        return [""] * len(df)
+    values = df[col]
+    cells: list = values.astype(object).where(values.notna(), "").tolist()
+    return cells
+
+
+def _sheet_ids(ws, column: str) -> set[str]:
+    """Non-empty values below the header in one column, e.g. "F" for job URLs.
+
+    An open-ended A1 range only returns populated rows, unlike `col_values`, and
+    unformatted values skip the server-side display formatting. Reading by column
+    returns one flat list instead of a one-cell list per row.
+    """
+    columns = ws.get(
+        f"{column}2:{column}",
+        major_dimension=Dimension.cols,
+        value_render_option=ValueRenderOption.unformatted,
+    )
+    return _column_ids(columns[0] if columns else [])
+
+
+def _column_ids(values: list) -> set[str]:
+    return {str(v).strip() for v in values if str(v).strip()}
 
 
-def _load_cached_ids(path: Path) -> set[str]:
-    if not path.exists():
-        return set()
-    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+def hydrate_id_caches() -> None:
+    """Fill every empty local id cache from the sheet in one values.batchGet request.
 
+    Call before running both syncs so a fresh cache costs one round-trip, not one per sync.
+    """
+    kinds = [kind for kind in _ID_COLUMNS if not _load_cached_ids(kind)]
+    if not kinds:
+        return
+    worksheets = {"job_url": ensure_jobs_worksheet, "report_name": ensure_reports_worksheet}
+    opened = [worksheets[kind]() for kind in kinds]
+    # Both worksheets live in the same spreadsheet, so any handle can send the batch
+    sheet = opened[0][0]
+    ranges = [
+        absolute_range_name(ws.title, f"{_ID_COLUMNS[kind]}2:{_ID_COLUMNS[kind]}")
+        for kind, (_, ws) in zip(kinds, opened)
+    ]
+    response = sheet.values_batch_get(
+        ranges,
+        params={"majorDimension": "COLUMNS", "valueRenderOption": "UNFORMATTED_VALUE"},
+    )
+    # valueRanges come back in request order; empty ranges have no "values" key
+    for kind, value_range in zip(kinds, response.get("valueRanges", [])):
+        columns = value_range.get("values") or [[]]
+        _persist_cached_ids(kind, _column_ids(columns[0]))
+
+
+def _id_cache() -> sqlite3.Connection:
+    """Local record of ids already in the sheet, one row per (kind, id)."""
+    conn = sqlite3.connect(ID_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS ids ("
+        "kind TEXT NOT NULL, id TEXT NOT NULL, PRIMARY KEY (kind, id)) WITHOUT ROWID"
+    )
+    return conn
 
-def _persist_cached_ids(path: Path, values: set[str]):
-    path.write_text("\n".join(sorted(values)), encoding="utf-8")
+
+def _load_cached_ids(kind: str) -> set[str]:
+    with closing(_id_cache()) as conn:
+        return {row[0] for row in conn.execute("SELECT id FROM ids WHERE kind = ?", (kind,))}
+
+
+def _persist_cached_ids(kind: str, values) -> None:
+    # Insert only the given ids in one transaction; existing rows are left untouched
+    with closing(_id_cache()) as conn, conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO ids (kind, id) VALUES (?, ?)", ((kind, v) for v in values)
+        )
 
 
 def _chunked(iterable, size=500):
@@ -102,44 +200,29 @@ def sync_jobs_to_google_sheets(df: pd.DataFrame) -> int:
     if df is None or df.empty:
         return 0
 
-    sheet = _authorize()
-    ws = _get_or_create_ws(
-        sheet,
-        os.getenv("GOOGLE_SHEET_WORKSHEET", "jobs"),
-        ["source", "title", "company", "location", "date_posted", "job_url", "skills", "lat", "lon", "sentiment"],
-    )
+    _, ws = ensure_jobs_worksheet()
 
-    cache_path = CACHE_DIR / "gsheets_jobs_urls.txt"
-    existing_urls = _load_cached_ids(cache_path)
+    existing_urls = _load_cached_ids("job_url")
     if not existing_urls:
-        existing_urls = set(filter(None, ws.col_values(6)[1:]))
-        _persist_cached_ids(cache_path, existing_urls)
-    new_rows = []
-    for _, record in df.iterrows():
-        url = str(record.get("job_url", "")).strip()
-        if not url or url in existing_urls:
-            continue
-        new_rows.append([
-            record.get("source", ""),
-            record.get("title", ""),
-            record.get("company", ""),
-            record.get("location", ""),
-            record.get("date_posted", ""),
-            url,
-            _normalize_skills(record.get("skills")),
-            record.get("lat", ""),
-            record.get("lon", ""),
-            record.get("sentiment", ""),
-        ])
+        existing_urls = _sheet_ids(ws, _ID_COLUMNS["job_url"])
+        _persist_cached_ids("job_url", existing_urls)
+
+    # Filter to unseen URLs column-wise, then assemble rows from whole columns
+    urls = pd.Series(_sheet_values(df, "job_url"), index=df.index).astype(str).str.strip()
+    unseen = urls.ne("") & ~urls.isin(existing_urls)
+    new = df[unseen]
+    columns = {col: _sheet_values(new, col) for col in JOBS_HEADER}
+    columns["job_url"] = urls[unseen].tolist()
+    columns["skills"] = [_normalize_skills(v) for v in columns["skills"]]
+    new_rows = [list(row) for row in zip(*columns.values())]
 
     appended = 0
     for chunk in _chunked(new_rows, size=500):
         ws.append_rows(chunk, value_input_option="RAW")
         appended += len(chunk)
     if appended:
-        new_ids = {row[5] for row in new_rows if len(row) >= 6 and row[5]}
-        existing_urls.update(new_ids)
-        _persist_cached_ids(cache_path, existing_urls)
+        # The unseen URLs were already stripped and filtered to non-empty above
+        _persist_cached_ids("job_url", columns["job_url"])
     return appended
 
 
@@ -147,40 +230,32 @@ def sync_reports_to_google_sheets(reports_df: pd.DataFrame) -> int:
     if reports_df is None or reports_df.empty:
         return 0
 
-    sheet = _authorize()
-    ws = _get_or_create_ws(
-        sheet,
-        os.getenv("GOOGLE_SHEET_WORKSHEET_REPORTS", "reports"),
-        ["report_name", "word_count", "skills"],
-        cols=10,
-    )
+    _, ws = ensure_reports_worksheet()
 
-    cache_path = CACHE_DIR / "gsheets_report_names.txt"
-    existing = _load_cached_ids(cache_path)
+    existing = _load_cached_ids("report_name")
     if not existing:
-        existing = set(filter(None, ws.col_values(1)[1:]))
-        _persist_cached_ids(cache_path, existing)
-    new_rows = []
-    for _, record in reports_df.iterrows():
-        name = str(record.get("report_name", "")).strip()
-        if not name or name in existing:
-            continue
-        text = str(record.get("text", ""))
-        word_count = record.get("word_count")
-        if pd.isna(word_count) or not word_count:
-            word_count = len(text.split())
-        new_rows.append([
-            name,
-            int(word_count),
-            _normalize_skills(record.get("skills")),
-        ])
+        existing = _sheet_ids(ws, _ID_COLUMNS["report_name"])
+        _persist_cached_ids("report_name", existing)
+
+    names = pd.Series(_sheet_values(reports_df, "report_name"), index=reports_df.index)
+    names = names.astype(str).str.strip()
+    unseen = names.ne("") & ~names.isin(existing)
+    new = reports_df[unseen]
+
+    # Missing or zero word counts fall back to a whitespace token count of the text
+    counts = pd.to_numeric(pd.Series(_sheet_values(new, "word_count"), index=new.index), errors="coerce")
+    missing = counts.isna() | counts.eq(0)
+    if missing.any():
+        texts = pd.Series(_sheet_values(new[missing], "text"), index=new.index[missing]).astype(str)
+        # Counted per text; .str.split().str.len() would keep every token list first
+        counts[missing] = texts.map(lambda t: len(t.split()))
+    skills = [_normalize_skills(v) for v in _sheet_values(new, "skills")]
+    new_rows = [list(row) for row in zip(names[unseen].tolist(), counts.astype(int).tolist(), skills)]
 
     appended = 0
     for chunk in _chunked(new_rows, size=500):
         ws.append_rows(chunk, value_input_option="RAW")
         appended += len(chunk)
     if appended:
-        new_ids = {str(row[0]) for row in new_rows if row and row[0]}
-        existing.update(new_ids)
-        _persist_cached_ids(cache_path, existing)
+        _persist_cached_ids("report_name", names[unseen])
     return appended
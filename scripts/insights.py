@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import functools
 import os
+import re
 from collections.abc import Iterable, Sequence
 from datetime import date
 from pathlib import Path
@@ -9,6 +11,7 @@ import pandas as pd
 import requests
 
 TopSkill = tuple[str, int]
+_PLACEHOLDER_RE = re.compile(r"\{\{[A-Z_]+\}\}")
 
 
 def _normalize_top_skills(values: Iterable[Sequence]) -> list[TopSkill]:
@@ -42,6 +45,19 @@ def _rules(top_skills_counts: list[TopSkill], limit: int = 12) -> str:
     return "\n".join(lines)
 
 
+@functools.lru_cache(maxsize=4)
+def _openai_client(base_url: str = ""):
+    """One OpenAI client per endpoint, so repeat calls reuse its connection pool."""
+    from openai import OpenAI
+
+    return OpenAI(base_url=base_url) if base_url else OpenAI()
+
+
+@functools.lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    return requests.Session()
+
+
 def _llm_call(prompt: str) -> str:
     if os.getenv("USE_LLM", "false").lower() != "true":
         return ""
@@ -52,12 +68,10 @@ def _llm_call(prompt: str) -> str:
 
     try:
         if provider in {"openai", "openai_compat"} and os.getenv("OPENAI_API_KEY"):
-            from openai import OpenAI
-
             base_url = ""
             if provider == "openai_compat":
                 base_url = os.getenv("LLM_BASE_URL", "").strip()
-            client = OpenAI(base_url=base_url) if base_url else OpenAI()
+            client = _openai_client(base_url)
             client_response = client.chat.completions.create(
                 model=model,
                 messages=[
@@ -82,7 +96,7 @@ def _llm_call(prompt: str) -> str:
                 return "(Ollama URL must be localhost for security)"
             if parsed.scheme not in ("http", "https"):
                 return "(Ollama URL must use http or https)"
-            http_response = requests.post(
+            http_response = _http_session().post(
                 f"{base}/api/generate",
                 json={"model": model, "prompt": prompt, "stream": False},
                 timeout=120,
@@ -120,9 +134,8 @@ def _render_prompt(analysis: dict, industry: str = "Cultural Resource & Heritage
         "{{GEOCODED}}": str(analysis.get("geocoded", 0)),
         "{{TOP_SKILLS_BULLETS}}": bullets or "- (no skill signals found)",
     }
-    for needle, value in replacements.items():
-        template = template.replace(needle, value)
-    return template
+    # One scan fills every placeholder; unknown ones are left as written
+    return _PLACEHOLDER_RE.sub(lambda m: replacements.get(m.group(0), m.group(0)), template)
 
 
 def generate_insights(
@@ -1,19 +1,34 @@
+import os
 import re
+import string
 from pathlib import Path
 
 import pandas as pd
 import spacy
 
+try:
+    # Optional: one pass per text over all aliases instead of one regex per alias
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Only doc.ents is read; NER runs on its own, so these are never loaded
+_UNUSED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+NLP_BATCH_SIZE = 64
+NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+
 _nlp = None
-_skills_df_cache: pd.DataFrame | None = None
+_skills_df_cache: tuple[int, pd.DataFrame] | None = None  # (taxonomy mtime_ns, frame)
 _skill_patterns: list[tuple[re.Pattern, str]] | None = None
+_skill_automaton = None
+_ASCII_LETTERS = frozenset(string.ascii_letters)
 
 
 def get_nlp():
     global _nlp
     if _nlp is None:
         try:
-            _nlp = spacy.load("en_core_web_sm")
+            _nlp = spacy.load("en_core_web_sm", exclude=_UNUSED_PIPES)
         except OSError as exc:
             raise RuntimeError(
                 "spaCy model not found. Run: python -m spacy download en_core_web_sm"
@@ -22,11 +37,16 @@ def get_nlp():
 
 
 def _load_taxonomy(base: Path) -> pd.DataFrame:
-    global _skills_df_cache
-    if _skills_df_cache is not None:
-        return _skills_df_cache
-
-    df = pd.read_csv(base / "skills" / "skills_taxonomy.csv")
+    global _skills_df_cache, _skill_patterns, _skill_automaton
+    path = base / "skills" / "skills_taxonomy.csv"
+    mtime = path.stat().st_mtime_ns
+    if _skills_df_cache is not None and _skills_df_cache[0] == mtime:
+        return _skills_df_cache[1]
+
+    # First load or the taxonomy was edited: matchers built from the old table are stale
+    _skill_patterns = None
+    _skill_automaton = None
+    df = pd.read_csv(path)
     df = df.rename(columns={c: c.lower() for c in df.columns})
     alias_col = "alias" if "alias" in df.columns else ("skill" if "skill" in df.columns else None)
     if alias_col is None:
@@ -35,8 +55,8 @@ def _load_taxonomy(base: Path) -> pd.DataFrame:
     df = df.rename(columns={alias_col: "alias", norm_col: "normalized_skill"})
     df["alias"] = df["alias"].fillna("").astype(str)
     df["normalized_skill"] = df["normalized_skill"].fillna(df["alias"]).astype(str)
-    _skills_df_cache = df[["alias", "normalized_skill"]].dropna()
-    return _skills_df_cache
+    _skills_df_cache = (mtime, df[["alias", "normalized_skill"]].dropna())
+    return _skills_df_cache[1]
 
 def _get_skill_patterns(skills_df: pd.DataFrame) -> list[tuple[re.Pattern, str]]:
     global _skill_patterns
@@ -44,9 +64,9 @@ def _get_skill_patterns(skills_df: pd.DataFrame) -> list[tuple[re.Pattern, str]]
         return _skill_patterns
 
     patterns = []
-    for _, row in skills_df.iterrows():
-        alias = row["alias"].strip().lower()
-        normalized = row["normalized_skill"].strip() or alias
+    for alias, normalized in zip(skills_df["alias"].tolist(), skills_df["normalized_skill"].tolist()):
+        alias = alias.strip().lower()
+        normalized = normalized.strip() or alias
         if not alias:
             continue
         rex = re.compile(rf"(?<![a-zA-Z]){re.escape(alias)}(?![a-zA-Z])")
@@ -55,8 +75,40 @@ def _get_skill_patterns(skills_df: pd.DataFrame) -> list[tuple[re.Pattern, str]]
     return _skill_patterns
 
 
+def _get_skill_automaton(skills_df: pd.DataFrame):
+    """Aho-Corasick automaton mapping each alias to its normalized skills, or None."""
+    global _skill_automaton
+    if _skill_automaton is None and ahocorasick is not None:
+        labels: dict[str, set[str]] = {}
+        for alias, normalized in zip(skills_df["alias"].tolist(), skills_df["normalized_skill"].tolist()):
+            alias = alias.strip().lower()
+            if alias:
+                labels.setdefault(alias, set()).add(normalized.strip() or alias)
+        automaton = ahocorasick.Automaton()
+        for alias, normalized in labels.items():
+            automaton.add_word(alias, (len(alias), normalized))
+        if labels:
+            automaton.make_automaton()
+        _skill_automaton = automaton
+    return _skill_automaton
+
+
 def _match_skills(text: str, skills_df: pd.DataFrame):
     text_l = text.lower()
+    automaton = _get_skill_automaton(skills_df)
+    if automaton is not None:
+        # Same boundaries as the regex path: no ASCII letter directly before or after
+        found = set()
+        if len(automaton):
+            for end, (length, normalized) in automaton.iter(text_l):
+                start = end - length + 1
+                if start > 0 and text_l[start - 1] in _ASCII_LETTERS:
+                    continue
+                if end + 1 < len(text_l) and text_l[end + 1] in _ASCII_LETTERS:
+                    continue
+                found.update(normalized)
+        return sorted(found)
+
     patterns = _get_skill_patterns(skills_df)
     found = set()
     for pattern, normalized in patterns:
@@ -65,11 +117,13 @@ def _match_skills(text: str, skills_df: pd.DataFrame):
     return sorted(found)
 
 
-def nlp_enrich(df: pd.DataFrame, is_job: bool) -> pd.DataFrame:
+def nlp_enrich(df: pd.DataFrame, is_job: bool, inplace: bool = False) -> pd.DataFrame:
+    """Add entities/orgs/places/skills columns; inplace=True skips the defensive copy."""
     if df is None:
         return df
 
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
     if df.empty:
         for col in ("entities", "orgs", "places", "skills"):
             if col not in df.columns:
@@ -84,12 +138,28 @@ def nlp_enrich(df: pd.DataFrame, is_job: bool) -> pd.DataFrame:
     if text_col not in df.columns:
         df[text_col] = ""
 
+    text = df[text_col].fillna("")
+    texts = text.tolist()
+    # spaCy sees at most 100k chars per doc; skills are still matched on the full text
+    docs = nlp.pipe(
+        text.str.slice(0, 100000).tolist(),
+        batch_size=NLP_BATCH_SIZE,
+        n_process=max(1, NLP_N_PROCESS),
+    )
     ents_list, orgs, places, skills_col = [], [], [], []
-    for txt in df[text_col].fillna("").tolist():
-        doc = nlp(txt[:100000])
-        ents_list.append([(e.text, e.label_) for e in doc.ents])
-        orgs.append([e.text for e in doc.ents if e.label_ == "ORG"])
-        places.append([e.text for e in doc.ents if e.label_ in ("GPE", "LOC")])
+    for txt, doc in zip(texts, docs):
+        # One walk over doc.ents (which builds fresh Spans per access) fills all three lists
+        ents, org, plc = [], [], []
+        for e in doc.ents:
+            ent_text, label = e.text, e.label_
+            ents.append((ent_text, label))
+            if label == "ORG":
+                org.append(ent_text)
+            elif label in ("GPE", "LOC"):
+                plc.append(ent_text)
+        ents_list.append(ents)
+        orgs.append(org)
+        places.append(plc)
         skills_col.append(_match_skills(txt, skills_df))
 
     df["entities"] = pd.Series(ents_list, index=df.index, dtype="object")
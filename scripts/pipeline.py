@@ -12,6 +12,7 @@ from scripts.geocode import geocode_locations
 from scripts.insights import generate_insights
 from scripts.nlp_entities import nlp_enrich
 from scripts.parse_reports import parse_all_reports
+from scripts.popups import popup_html
 from scripts.scrape_jobs import scrape_sources
 from scripts.sentiment_salience import add_sentiment_and_terms
 
@@ -22,16 +23,14 @@ def enrich_report_metadata(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     df["word_count"] = df["text"].fillna("").astype(str).apply(lambda t: len(t.split()))
 
-    def summarize_entities(row):
-        entities = []
-        for collection in (row.get("orgs") or [], row.get("places") or []):
-            for value in collection:
-                cleaned = str(value).strip()
-                if cleaned and cleaned not in entities:
-                    entities.append(cleaned)
-        return ", ".join(entities[:10])
+    def summarize_entities(orgs, places):
+        # dict.fromkeys keeps first-seen order while dropping repeats
+        cleaned = (str(value).strip() for value in [*(orgs or []), *(places or [])])
+        return ", ".join(list(dict.fromkeys(v for v in cleaned if v))[:10])
 
-    df["top_entities"] = df.apply(summarize_entities, axis=1)
+    orgs = df["orgs"] if "orgs" in df.columns else [None] * len(df)
+    places = df["places"] if "places" in df.columns else [None] * len(df)
+    df["top_entities"] = [summarize_entities(o, p) for o, p in zip(orgs, places)]
     return df
 
 
@@ -43,13 +42,12 @@ def _skills_to_string(value):
     return ""
 
 
-def _skills_to_json(value):
+def _skills_to_list(value):
     if isinstance(value, list):
-        return json.dumps(value, ensure_ascii=False)
+        return [str(v) for v in value]
     if isinstance(value, str) and value.strip():
-        parts = [part.strip() for part in value.split(";") if part.strip()]
-        return json.dumps(parts, ensure_ascii=False)
-    return "[]"
+        return [part.strip() for part in value.split(";") if part.strip()]
+    return []
 
 
 def ensure_dirs(base: Path):
@@ -73,9 +71,10 @@ def main():
     jobs_df = clean_and_dedupe(jobs_df)
     reports_df = parse_all_reports(base / "reports")
 
-    jobs_df = nlp_enrich(jobs_df, is_job=True)
+    # Both frames were just built above, so enrich them without another copy
+    jobs_df = nlp_enrich(jobs_df, is_job=True, inplace=True)
     if reports_df is not None and not reports_df.empty:
-        reports_df = nlp_enrich(reports_df, is_job=False)
+        reports_df = nlp_enrich(reports_df, is_job=False, inplace=True)
         reports_df = enrich_report_metadata(reports_df)
 
     jobs_df = add_sentiment_and_terms(jobs_df, text_col="description")
@@ -107,20 +106,37 @@ JOBS_CSV_COLUMNS = [
     "url", "description", "sentiment",
 ]
 
+# Low-cardinality columns stored dictionary-encoded in jobs.parquet
+JOBS_CATEGORICAL_COLUMNS = ["state", "job_type", "seniority", "currency"]
+
 REPORTS_CSV_COLUMNS = [
     "report_name", "word_count", "skills", "top_entities", "text",
 ]
 
 
 def _save_processed_data(jobs_df, reports_df, proc):
-    """Save processed data to CSV with stable column ordering."""
-    jobs_to_save = jobs_df.copy()
-    jobs_to_save["skills_list"] = jobs_to_save["skills"].apply(_skills_to_json)
-    jobs_to_save["skills"] = jobs_to_save["skills"].apply(_skills_to_string)
+    """Save processed data to CSV (and jobs to Parquet) with stable column ordering."""
+    popups = popup_html(jobs_df)
+    skill_lists = jobs_df["skills"].map(_skills_to_list)
+    # Derived columns are built as separate Series; the caller's frame is never copied whole
+    derived = {
+        "skills": jobs_df["skills"].map(_skills_to_string),
+        "skills_list": skill_lists.map(lambda v: json.dumps(v, ensure_ascii=False)),
+    }
 
     # Ensure stable column order (only include columns that exist)
-    job_cols = [c for c in JOBS_CSV_COLUMNS if c in jobs_to_save.columns]
-    jobs_to_save[job_cols].to_csv(proc / "jobs.csv", index=False)
+    job_cols = [c for c in JOBS_CSV_COLUMNS if c in jobs_df.columns or c in derived]
+    source_cols = [c for c in job_cols if c not in derived]
+    jobs_out = jobs_df[source_cols].assign(**derived)[job_cols]
+    jobs_out.to_csv(proc / "jobs.csv", index=False)
+
+    # Parquet copy for the dashboard: typed, compressed, and readable column-by-column.
+    # skills_list is a native list<string> column so readers never re-parse JSON.
+    categoricals = {c: "category" for c in JOBS_CATEGORICAL_COLUMNS if c in job_cols}
+    jobs_parquet = jobs_out.astype(categoricals).assign(skills_list=skill_lists, popup_html=popups)
+    jobs_parquet.to_parquet(
+        proc / "jobs.parquet", engine="pyarrow", compression="zstd", index=False
+    )
 
     if reports_df is not None and not reports_df.empty:
         report_cols = [c for c in REPORTS_CSV_COLUMNS if c in reports_df.columns]
@@ -146,8 +162,15 @@ def _sync_to_google_sheets(jobs_df, reports_df):
         return
 
     try:
-        from scripts.gsheets_sync import sync_jobs_to_google_sheets, sync_reports_to_google_sheets
+        from scripts.gsheets_sync import (
+            hydrate_id_caches,
+            sync_jobs_to_google_sheets,
+            sync_reports_to_google_sheets,
+        )
 
+        if reports_df is not None and not reports_df.empty:
+            # Both syncs will run: read their existing ids in a single request
+            hydrate_id_caches()
         job_rows = sync_jobs_to_google_sheets(jobs_df)
         print(f"Google Sheets: appended {job_rows} new job rows.")
 
@@ -0,0 +1,53 @@
+"""Map popup HTML for job postings, shared by the pipeline and the dashboard."""
+
+from __future__ import annotations
+
+import html
+
+import pandas as pd
+
+
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    values: pd.Series = df[col].astype(object).fillna("").astype(str)
+    return values.str.strip()
+
+
+def _skill_names(value) -> list[str]:
+    # Lists from skills_list / NLP enrichment, or the ";"-joined `skills` text
+    if isinstance(value, list):
+        return [str(v) for v in value if v]
+    if isinstance(value, str):
+        return [s for s in value.split(";") if s]
+    return []
+
+
+def popup_html(df: pd.DataFrame) -> pd.Series:
+    """Escaped popup HTML per job: bold title, company, city/state, top skills and link."""
+    # Sanitize all user-controlled content to prevent XSS
+    title = _text(df, "title").map(html.escape)
+    company = _text(df, "company").map(html.escape)
+    if {"city", "state"}.issubset(df.columns):
+        loc_txt = _text(df, "city").map(html.escape) + ", " + _text(df, "state").map(html.escape)
+    else:
+        loc_txt = pd.Series("", index=df.index, dtype=object)
+    skills_col = "skills_list" if "skills_list" in df.columns else "skills"
+    if skills_col in df.columns:
+        skills = df[skills_col].map(
+            lambda v: ", ".join(html.escape(s) for s in _skill_names(v)[:5])
+        )
+    else:
+        skills = pd.Series("", index=df.index, dtype=object)
+    line1 = ("<b>" + title + "</b>").where(title != "", "")
+
+    # Only http(s) links are rendered
+    url = _text(df, "url")
+    links = (
+        '<br><a href="' + url.map(html.escape)
+        + '" target="_blank" rel="noopener noreferrer">Job posting</a>'
+    ).where(url.str.startswith(("http://", "https://")), "")
+
+    body = ["<br>".join(x for x in parts if x) for parts in zip(line1, company, loc_txt, skills)]
+    popups: pd.Series = pd.Series(body, index=df.index, dtype=object) + links
+    return popups
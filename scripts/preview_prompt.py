@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import sys
 from pathlib import Path
 
@@ -7,14 +9,29 @@ from scripts.analyze import analyze_market
 from scripts.insights import _render_prompt
 
 BASE = Path(__file__).resolve().parents[1]
+# Columns analyze_market reads; the Parquet copy is loaded column-by-column
+ANALYSIS_COLUMNS = ["company", "skills", "lat", "lon", "description"]
+
+
+def _read_jobs(proc: Path) -> pd.DataFrame | None:
+    pq_path = proc / "jobs.parquet"
+    if pq_path.exists():
+        import pyarrow.parquet as pq
+
+        names = pq.read_schema(pq_path).names
+        return pd.read_parquet(pq_path, columns=[c for c in ANALYSIS_COLUMNS if c in names])
+    # Older pipeline runs only wrote CSV
+    csv_path = proc / "jobs.csv"
+    if csv_path.exists():
+        return pd.read_csv(csv_path)
+    return None
 
 
 def main():
-    proc = BASE / "data" / "processed" / "jobs.csv"
-    if not proc.exists():
-        sys.exit("Run the pipeline first to generate data/processed/jobs.csv")
+    jobs = _read_jobs(BASE / "data" / "processed")
+    if jobs is None:
+        sys.exit("Run the pipeline first to generate data/processed/jobs.parquet")
 
-    jobs = pd.read_csv(proc)
     analysis = analyze_market(jobs, None)
     analysis_dict = analysis.to_dict() if hasattr(analysis, "to_dict") else dict(analysis)
     prompt = _render_prompt(analysis_dict)
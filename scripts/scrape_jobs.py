@@ -1,76 +1,185 @@
+import atexit
 import json
 import os
 import re
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from threading import Lock, local
+from threading import Condition, Lock
 from urllib.parse import urljoin, urlparse
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    # Optional: C (Lexbor) HTML parser for the per-job description pages
+    from selectolax.lexbor import LexborHTMLParser
+
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    # Optional: libxml2 tree builder for BeautifulSoup, much faster than html.parser
+    import lxml  # noqa: F401
+
+    _SOUP_FEATURES = "lxml"
+except ImportError:
+    _SOUP_FEATURES = "html.parser"
 
 MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", "4"))
 REQUEST_INTERVAL = float(os.getenv("SCRAPER_REQUEST_INTERVAL", "0.8"))
 REFILL_RATE = MAX_WORKERS / max(REQUEST_INTERVAL, 0.1)
 _rate_lock = Lock()
-_thread_state = local()
+_rate_cv = Condition(_rate_lock)
 _tokens = float(MAX_WORKERS)
 _last_refill = time.monotonic()
+_SESSION: requests.Session | None = None
+_session_lock = Lock()
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 CACHE_DIR = BASE_DIR / "data" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
-DESC_CACHE_PATH = CACHE_DIR / "job_descriptions.json"
+# Append-only JSON Lines log of {"url", "text"} records; the last record per URL wins
+DESC_CACHE_PATH = CACHE_DIR / "job_descriptions.jsonl"
+# Single-blob cache written by earlier versions, imported once into the log
+LEGACY_DESC_CACHE_PATH = CACHE_DIR / "job_descriptions.json"
 _DESC_CACHE: dict[str, str] | None = None
-_DESC_CACHE_DIRTY = False
+_DESC_LOG_LINES = 0  # records in DESC_CACHE_PATH, superseded ones included
+# Limit cache size to prevent DoS via a malicious cache file
+_MAX_DESC_CACHE_BYTES = 50_000_000
+_desc_log_lock = Lock()
+
+# Class/attribute matchers shared by the listing parsers, compiled once per process
+_NEXT_RE = re.compile("next", re.I)
+_PAGER_RE = re.compile(r"pagination|pager|nav", re.I)
+_PAGER_CURRENT_RE = re.compile(r"active|current", re.I)
+_COMPANY_RE = re.compile(r"company", re.I)
+_LOCATION_RE = re.compile(r"location", re.I)
+_DATE_RE = re.compile(r"date", re.I)
+_JOB_HREF_RE = re.compile(r"job", re.I)
+_DESC_CONTAINER_RE = re.compile(r"description|content", re.I)
+_DESC_CONTAINER_CSS = "div[class*=description i], div[class*=content i]"
 
 
 def _load_desc_cache() -> dict[str, str]:
     """Load description cache with safe JSON deserialization."""
-    global _DESC_CACHE
+    global _DESC_CACHE, _DESC_LOG_LINES
+    # Lock-free once loaded; workers that race on the first call load the file only once
     if _DESC_CACHE is not None:
         return _DESC_CACHE
-    if DESC_CACHE_PATH.exists():
-        try:
-            raw = DESC_CACHE_PATH.read_text(encoding="utf-8")
-            # Limit cache size to prevent DoS via malicious cache file
-            if len(raw) > 50_000_000:  # 50MB limit
-                print("Warning: Description cache too large, resetting")
-                _DESC_CACHE = {}
-            else:
-                loaded = json.loads(raw)
-                # Validate structure: must be dict with string keys/values
-                if isinstance(loaded, dict):
-                    _DESC_CACHE = {str(k): str(v)[:20000] for k, v in loaded.items()}
-                else:
-                    _DESC_CACHE = {}
-        except (json.JSONDecodeError, OSError, TypeError):
-            _DESC_CACHE = {}
-    else:
-        _DESC_CACHE = {}
+    with _desc_log_lock:
+        if _DESC_CACHE is None:
+            _DESC_CACHE, _DESC_LOG_LINES = _read_desc_log()
     return _DESC_CACHE
 
 
+def _read_desc_log() -> tuple[dict[str, str], int]:
+    cache: dict[str, str] = {}
+    lines = 0
+    try:
+        if DESC_CACHE_PATH.stat().st_size > _MAX_DESC_CACHE_BYTES:
+            print("Warning: Description cache too large, resetting")
+            # Truncate now: compaction only triggers on superseded records, so an
+            # oversized log left in place would keep growing and never be reread
+            DESC_CACHE_PATH.write_bytes(b"")
+        else:
+            with DESC_CACHE_PATH.open(encoding="utf-8") as fh:
+                for line in fh:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        # Validate structure: must be an object with a url and its text
+                        cache[str(record["url"])] = str(record["text"])[:20000]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+    except FileNotFoundError:
+        # First run on this version: migrate the legacy blob into a fresh log once, so
+        # later runs read the log and never touch the legacy file again
+        cache = _load_legacy_desc_cache()
+        try:
+            _write_desc_log(cache)
+            lines = len(cache)
+        except OSError:
+            pass
+    except OSError:
+        pass
+    return cache, lines
+
+
+def _load_legacy_desc_cache() -> dict[str, str]:
+    try:
+        raw = LEGACY_DESC_CACHE_PATH.read_text(encoding="utf-8")
+        if len(raw) > _MAX_DESC_CACHE_BYTES:
+            return {}
+        loaded = json.loads(raw)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(loaded, dict):
+        return {}
+    return {str(k): str(v)[:20000] for k, v in loaded.items()}
+
+
+def _desc_record(url: str, text: str) -> str:
+    return json.dumps({"url": url, "text": text}) + "\n"
+
+
+def _write_desc_log(cache: dict[str, str]):
+    """Replace the log with one record per cached URL (written aside, then renamed)."""
+    tmp = DESC_CACHE_PATH.with_suffix(".jsonl.tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        fh.writelines(_desc_record(url, text) for url, text in cache.items())
+    os.replace(tmp, DESC_CACHE_PATH)
+
+
+def _store_desc(url: str, text: str):
+    """Cache one description and append it to the log; nothing else is rewritten."""
+    global _DESC_LOG_LINES
+    cache = _load_desc_cache()
+    with _desc_log_lock:
+        cache[url] = text
+        try:
+            with DESC_CACHE_PATH.open("a", encoding="utf-8") as fh:
+                fh.write(_desc_record(url, text))
+            _DESC_LOG_LINES += 1
+        except OSError:
+            pass
+
+
 def _save_desc_cache():
-    global _DESC_CACHE_DIRTY
-    if not _DESC_CACHE_DIRTY or _DESC_CACHE is None:
+    """Compact the log once superseded records outnumber the live ones."""
+    global _DESC_LOG_LINES
+    if _DESC_CACHE is None:
         return
-    DESC_CACHE_PATH.write_text(json.dumps(_DESC_CACHE), encoding="utf-8")
-    _DESC_CACHE_DIRTY = False
+    with _desc_log_lock:
+        if _DESC_LOG_LINES <= 2 * len(_DESC_CACHE):
+            return
+        try:
+            _write_desc_log(_DESC_CACHE)
+        except OSError:
+            return
+        _DESC_LOG_LINES = len(_DESC_CACHE)
+
+
+atexit.register(_save_desc_cache)
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, _SOUP_FEATURES)
 
 
 def _find_next_page(soup, base):
     cand = None
     # rel="next"
-    link = soup.find("a", rel=lambda v: v and "next" in v.lower())
+    link = soup.find("a", rel=_NEXT_RE)
     if link and link.get("href"):
         cand = link["href"]
     if not cand:
         link = (
-            soup.find("a", attrs={"aria-label": re.compile("next", re.I)})
-            or soup.find("a", title=re.compile("next", re.I))
+            soup.find("a", attrs={"aria-label": _NEXT_RE})
+            or soup.find("a", title=_NEXT_RE)
         )
         if link and link.get("href"):
             cand = link["href"]
@@ -81,9 +190,9 @@ def _find_next_page(soup, base):
                 cand = a["href"]
                 break
     if not cand:
-        pagers = soup.find_all(class_=re.compile(r"pagination|pager|nav", re.I))
+        pagers = soup.find_all(class_=_PAGER_RE)
         for p in pagers:
-            cur = p.find(class_=re.compile(r"active|current", re.I))
+            cur = p.find(class_=_PAGER_CURRENT_RE)
             if cur:
                 sib = cur.find_next("a", href=True)
                 if sib:
@@ -109,8 +218,8 @@ def _find_next_page(soup, base):
 def _acquire_slot():
     """Token bucket: allow up to MAX_WORKERS requests per REQUEST_INTERVAL on average."""
     global _tokens, _last_refill
-    while True:
-        with _rate_lock:
+    with _rate_cv:
+        while True:
             now = time.monotonic()
             elapsed = now - _last_refill
             if elapsed > 0:
@@ -119,26 +228,55 @@ def _acquire_slot():
             if _tokens >= 1.0:
                 _tokens -= 1.0
                 return
-            # Need to wait for enough tokens to accumulate
-            missing = 1.0 - _tokens
-            wait_time = missing / REFILL_RATE
-        time.sleep(max(wait_time, 0.05))
+            # Sleep (lock released) until exactly the next token is due; no polling floor
+            _rate_cv.wait(timeout=(1.0 - _tokens) / REFILL_RATE)
+
+
+def _session() -> requests.Session:
+    """One pooled session shared by every worker, so keep-alive sockets serve the whole crawl.
+
+    Built on first use rather than at import so USER_AGENT from .env is already loaded.
+    """
+    global _SESSION
+    # Lock-free once built; workers racing on the first call still build only one
+    if _SESSION is not None:
+        return _SESSION
+    with _session_lock:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=8, pool_maxsize=max(MAX_WORKERS * 2, 10), max_retries=0
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = os.getenv("USER_AGENT", "CHARM/1.0 (research)")
+            _SESSION = session
+    return _SESSION
+
+
+def _decode(resp: requests.Response) -> str:
+    """Body text without requests' charset guessing when the server names no charset.
+
+    Undeclared bodies are tried as UTF-8 first (a single C-level decode); only if that
+    fails does resp.text pick the encoding as before.
+    """
+    if "charset" in resp.headers.get("Content-Type", "").lower():
+        return resp.text
+    try:
+        return resp.content.decode("utf-8")
+    except UnicodeDecodeError:
+        return resp.text
 
 
 def _fetch(url):
     _acquire_slot()
-    session = getattr(_thread_state, "session", None)
-    if session is None:
-        session = requests.Session()
-        _thread_state.session = session
-    user_agent = os.getenv("USER_AGENT", "CHARM/1.0 (research)")
-    session.headers.update({"User-Agent": user_agent})
+    session = _session()
     backoff = 0.5
     for attempt in range(3):
         try:
             resp = session.get(url, timeout=25)
             resp.raise_for_status()
-            return resp.text
+            return _decode(resp)
         except requests.RequestException:
             if attempt == 2:
                 raise
@@ -148,10 +286,9 @@ def _fetch(url):
 
 def _parse_generic(soup, base, source):
     jobs = []
-    for a in soup.find_all("a", href=True):
+    # Only job-looking links ("/jobs/" included) reach the text extraction below
+    for a in soup.find_all("a", href=_JOB_HREF_RE):
         href = a["href"]
-        if "job" not in href.lower() and "/jobs/" not in href.lower():
-            continue
         text = a.get_text(strip=True)
         jobs.append({
             "source": source,
@@ -163,87 +300,98 @@ def _parse_generic(soup, base, source):
         })
     return jobs
 
+def _text_of(el) -> str:
+    return el.get_text(strip=True) if el else ""
+
+
+def _date_posted(el) -> str:
+    # Prefer the machine-readable <time datetime="..."> over the display text
+    if el and el.has_attr("datetime"):
+        return str(el.get("datetime", ""))
+    return _text_of(el)
+
+
+def _acra_row(it, base) -> dict | None:
+    a = it.find("a", href=True)
+    if not a:
+        return None
+    company_el = it.find("div", class_=_COMPANY_RE) or it.find("span", class_=_COMPANY_RE)
+    location_el = it.find("div", class_=_LOCATION_RE) or it.find("span", class_=_LOCATION_RE)
+    return {
+        "source": "ACRA",
+        "title": _text_of(it.find("h3") or it.find("h2") or a),
+        "company": _text_of(company_el),
+        "location": _text_of(location_el),
+        "date_posted": _date_posted(it.find("time") or it.find("span", class_=_DATE_RE)),
+        "job_url": urljoin(base, a["href"]),
+    }
+
+
 def parse_acra(html, base):
-    soup = BeautifulSoup(html, "html.parser")
+    return _parse_acra_soup(_soup(html), base)
+
+
+def _parse_acra_soup(soup, base):
     items = soup.select(".job_listings .job_listing, article.job_listing") or soup.select("article")
-    jobs = []
-    for it in items:
-        a = it.find("a", href=True)
-        if not a:
-            continue
-        link = urljoin(base, a["href"])
-        title_el = it.find("h3") or it.find("h2") or a
-        title = title_el.get_text(strip=True)
-
-        company_el = (
-            it.find("div", class_=re.compile(r"company", re.I))
-            or it.find("span", class_=re.compile(r"company", re.I))
-        )
-        company = company_el.get_text(strip=True) if company_el else ""
+    jobs = [row for it in items if (row := _acra_row(it, base))]
+    return jobs or _parse_generic(soup, base, "ACRA")
 
-        location_el = (
-            it.find("div", class_=re.compile(r"location", re.I))
-            or it.find("span", class_=re.compile(r"location", re.I))
-        )
-        location = location_el.get_text(strip=True) if location_el else ""
 
-        date_el = it.find("time") or it.find("span", class_=re.compile(r"date", re.I))
-        if date_el and date_el.has_attr("datetime"):
-            date_posted = date_el.get("datetime", "")
-        else:
-            date_posted = date_el.get_text(strip=True) if date_el else ""
+def _aaa_row(c, base) -> dict | None:
+    a = c.find("a", href=True)
+    if not a:
+        return None
+    title_el = c.select_one("[data-automation='job-title']") or c.find("h3") or a
+    company_el = c.select_one("[data-automation='job-company']") or c.find("h4")
+    loc_el = (
+        c.select_one("[data-automation='job-location']")
+        or c.find("span", class_=_LOCATION_RE)
+    )
+    return {
+        "source": "AAA",
+        "title": _text_of(title_el),
+        "company": _text_of(company_el),
+        "location": _text_of(loc_el),
+        "date_posted": _date_posted(c.find("time") or c.find("span", class_=_DATE_RE)),
+        "job_url": urljoin(base, a["href"]),
+    }
 
-        jobs.append({
-            "source": "ACRA",
-            "title": title,
-            "company": company,
-            "location": location,
-            "date_posted": date_posted,
-            "job_url": link,
-        })
-    return jobs or _parse_generic(soup, base, "ACRA")
 
 def parse_aaa(html, base):
-    soup = BeautifulSoup(html, "html.parser")
-    cards = soup.select("[data-automation='job-card']") or soup.select(".job-preview") or []
-    jobs = []
-    for c in cards:
-        a = c.find("a", href=True)
-        if not a:
-            continue
-        link = urljoin(base, a["href"])
-
-        title_el = (
-            c.select_one("[data-automation='job-title']")
-            or c.find("h3")
-            or a
-        )
-        title = title_el.get_text(strip=True)
+    return _parse_aaa_soup(_soup(html), base)
+
 
-        company_el = c.select_one("[data-automation='job-company']") or c.find("h4")
-        company = company_el.get_text(strip=True) if company_el else ""
+def _parse_aaa_soup(soup, base):
+    cards = soup.select("[data-automation='job-card']") or soup.select(".job-preview") or []
+    jobs = [row for c in cards if (row := _aaa_row(c, base))]
+    return jobs or _parse_generic(soup, base, "AAA")
 
-        loc_el = (
-            c.select_one("[data-automation='job-location']")
-            or c.find("span", class_=re.compile(r"location", re.I))
+def _desc_text(html: str) -> str:
+    """Visible text of the job description container, or of the whole page."""
+    if HAS_SELECTOLAX:
+        tree = LexborHTMLParser(html)
+        # BeautifulSoup's get_text leaves out script/style contents
+        tree.strip_tags(["script", "style", "template"])
+        node = (
+            tree.css_first("article")
+            or tree.css_first("div#job-description")
+            or tree.css_first(_DESC_CONTAINER_CSS)
         )
-        location = loc_el.get_text(strip=True) if loc_el else ""
+        if node is None:
+            node = tree.root
+        if node is None:
+            return ""
+        # Join non-blank stripped text nodes with single spaces, as get_text(" ", strip=True)
+        return " ".join(t for t in node.text(separator="\x00", strip=True).split("\x00") if t)
+
+    soup = _soup(html)
+    container = (
+        soup.find("article")
+        or soup.find("div", id="job-description")
+        or soup.find("div", class_=_DESC_CONTAINER_RE)
+    )
+    return str((container or soup).get_text(" ", strip=True))
 
-        date_el = c.find("time") or c.find("span", class_=re.compile(r"date", re.I))
-        if date_el and date_el.has_attr("datetime"):
-            date_posted = date_el.get("datetime", "")
-        else:
-            date_posted = date_el.get_text(strip=True) if date_el else ""
-
-        jobs.append({
-            "source": "AAA",
-            "title": title,
-            "company": company,
-            "location": location,
-            "date_posted": date_posted,
-            "job_url": link,
-        })
-    return jobs or _parse_generic(soup, base, "AAA")
 
 def _fetch_job_desc(url):
     cache = _load_desc_cache()
@@ -251,37 +399,29 @@ def _fetch_job_desc(url):
     if cached is not None:
         return cached
 
-    global _DESC_CACHE_DIRTY
     try:
         html = _fetch(url)
-        soup = BeautifulSoup(html, "html.parser")
-        container = (
-            soup.find("article")
-            or soup.find("div", id="job-description")
-            or soup.find("div", class_=re.compile(r"description|content", re.I))
-        )
-        txt = container.get_text(" ", strip=True) if container else soup.get_text(" ", strip=True)
-        snippet = txt[:20000]
-        cache[url] = snippet
-        _DESC_CACHE_DIRTY = True
+        snippet = _desc_text(html)[:20000]
+        _store_desc(url, snippet)
         return snippet
     except (requests.RequestException, OSError):
-        cache[url] = ""
-        _DESC_CACHE_DIRTY = True
+        _store_desc(url, "")
         return ""
 
 def scrape_sources():
     sources = [
-        ("https://acra-crm.org/jobs/", parse_acra),
-        ("https://careercenter.americananthro.org/jobs/cultural-resource-management/", parse_aaa),
+        ("https://acra-crm.org/jobs/", _parse_acra_soup),
+        ("https://careercenter.americananthro.org/jobs/cultural-resource-management/", _parse_aaa_soup),
     ]
     rows = []
-    for base, parser in sources:
-        try:
-            page_rows = _walk_pages(base, parser, max_pages=10)
-            rows.extend(page_rows)
-        except Exception as e:
-            print(f"Scrape failed for {base}: {e}")
+    # Sources are walked side by side; _acquire_slot still caps the combined request rate
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        walks = [(base, pool.submit(_walk_pages, base, parser, 10)) for base, parser in sources]
+        for base, future in walks:
+            try:
+                rows.extend(future.result())
+            except Exception as e:
+                print(f"Scrape failed for {base}: {e}")
     df = pd.DataFrame(rows)
     if df.empty:
         return df
@@ -301,9 +441,14 @@ def scrape_sources():
 
 
 def _walk_pages(start_url, parser, max_pages=10):
+    """Follow next-page links from start_url; parser(soup, url) reads the listings.
+
+    Each page is parsed into one soup shared by the listing parser and _find_next_page.
+    """
     visited = set()
     url = start_url
     rows = []
+    seen = set()  # job URLs already in rows; repeats across pages are dropped on arrival
 
     for _ in range(max_pages):
         if not url or url in visited:
@@ -316,20 +461,18 @@ def _walk_pages(start_url, parser, max_pages=10):
             print(f"Fetch failed for {url}: {e}")
             break
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = _soup(html)
         try:
-            page_rows = parser(html, url)
-            rows.extend(page_rows)
+            page_rows = parser(soup, url)
         except (AttributeError, TypeError) as e:
             print(f"Parse failed for {url}: {e}")
+            page_rows = []
+        for r in page_rows:
+            job_url = r.get("job_url", "")
+            if job_url and job_url not in seen:
+                seen.add(job_url)
+                rows.append(r)
 
         url = _find_next_page(soup, url)
 
-    seen = set()
-    unique = []
-    for r in rows:
-        job_url = r.get("job_url", "")
-        if job_url and job_url not in seen:
-            unique.append(r)
-            seen.add(job_url)
-    return unique
+    return rows
@@ -1,3 +1,6 @@
+import functools
+
+import numpy as np
 import pandas as pd
 
 try:
@@ -8,7 +11,9 @@ except ImportError:
     _NLTK_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=1)
 def _ensure_vader():
+    # The analyzer loads the whole VADER lexicon on construction; build it once per process
     if not _NLTK_AVAILABLE:
         return None
     try:
@@ -23,13 +28,13 @@ def add_sentiment_and_terms(df: pd.DataFrame, text_col: str):
     if df is None or df.empty:
         return df
     sia = _ensure_vader()
-    sentiments = []
-    for txt in df[text_col].fillna("").tolist():
-        if sia:
-            score = sia.polarity_scores(txt).get("compound", 0.0)
-        else:
-            score = 0.0
-        sentiments.append(score)
-    out = df.copy()
-    out["sentiment"] = sentiments
-    return out
+    texts = df[text_col].fillna("")
+    sentiments = np.zeros(len(texts))
+    if sia:
+        # Blank descriptions score 0.0 without going through VADER's tokenizer
+        scored = (texts.str.len() > 0).to_numpy()
+        # Reposted or boilerplate descriptions repeat; each distinct text is scored once
+        to_score = texts[scored]
+        compound = {txt: sia.polarity_scores(txt).get("compound", 0.0) for txt in to_score.unique()}
+        sentiments[scored] = to_score.map(compound).to_numpy(dtype=float)
+    return df.assign(sentiment=sentiments)
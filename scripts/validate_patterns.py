@@ -8,9 +8,11 @@ def main():
     base = Path(__file__).resolve().parents[1]
     cfg_path = base / "config" / "job_patterns.json"
     data = json.loads(cfg_path.read_text(encoding="utf-8"))
-    problems = []
+    problems: list[str] = []
 
-    def _validate_entries(entries):
+    def _validate_entries(bucket, entries):
+        before = len(problems)
+        patterns = []
         for entry in entries:
             pattern = entry if isinstance(entry, str) else entry.get("pattern")
             if not pattern:
@@ -18,14 +20,23 @@ def main():
                 continue
             try:
                 re.compile(pattern, re.I)
+                patterns.append(pattern)
             except re.error as exc:
                 problems.append(f"Invalid regex '{pattern}': {exc}")
-
-    for _bucket, entries in data.get("job_type", {}).items():
-        _validate_entries(entries)
-
-    for _bucket, entries in data.get("seniority", {}).items():
-        _validate_entries(entries)
+        if len(problems) > before:
+            return
+        # data_cleaning matches each bucket as one alternation; check that it compiles too
+        # (e.g. a named group repeated across entries only fails once they are joined)
+        try:
+            re.compile("|".join(f"(?:{p})" for p in patterns), re.I)
+        except re.error as exc:
+            problems.append(f"Patterns for '{bucket}' cannot be combined: {exc}")
+
+    for bucket, entries in data.get("job_type", {}).items():
+        _validate_entries(bucket, entries)
+
+    for bucket, entries in data.get("seniority", {}).items():
+        _validate_entries(bucket, entries)
 
     if problems:
         sys.exit("Invalid job pattern config:\n- " + "\n- ".join(problems))
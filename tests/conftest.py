@@ -5,11 +5,15 @@ Shared fixtures for testing pipeline components without external dependencies.
 """
 
 import json
+import sys
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
+# Make the `scripts` package importable from every test module, once per session
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # Test fixtures directory
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -6,13 +6,9 @@ correctly-structured outputs.
 """
 
 import json
-import sys
-from pathlib import Path
 
 import pandas as pd
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from scripts.analyze import _ensure_skill_lists, analyze_market
 
 
@@ -6,16 +6,16 @@ without requiring external services.
 """
 
 # Import the functions we're testing
-import sys
-from pathlib import Path
 
 import pandas as pd
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from scripts.data_cleaning import (
+    _dedupe_keys,
+    _extract_salaries,
     _hash_row,
     _parse_city_state,
+    _parse_city_states,
+    _row_key,
     clean_and_dedupe,
     extract_salary,
 )
@@ -49,6 +49,26 @@ class TestExtractSalary:
         assert low is None
         assert high is None
 
+    def test_long_whitespace_runs(self):
+        """Padded descriptions should still match (and not backtrack quadratically)."""
+        low, high, currency = extract_salary(" " * 5000 + "Pay: $65,000 to $80,000")
+        assert (low, high, currency) == (65000.0, 80000.0, "USD")
+
+    def test_vectorized_matches_scalar(self):
+        """Column-wise extraction should agree with extract_salary."""
+        texts = pd.Series([
+            "Salary: $65,000-$80,000 per year",
+            "Starting at $50,000",
+            "Great benefits",
+            "",
+        ])
+        result = _extract_salaries(texts)
+        for text, row in zip(texts, result.itertuples(index=False)):
+            low, high, currency = extract_salary(text)
+            assert (row.salary_min if pd.notna(row.salary_min) else None) == low
+            assert (row.salary_max if pd.notna(row.salary_max) else None) == high
+            assert (row.currency if pd.notna(row.currency) else None) == currency
+
 
 class TestHashRow:
     """Tests for content hashing used in deduplication."""
@@ -77,6 +97,18 @@ class TestHashRow:
         hash2 = _hash_row("", "Company", "Desc")
         assert hash1 == hash2
 
+    def test_vectorized_keys_match_row_hash(self, sample_jobs_df):
+        """Column-wise dedupe keys should group rows exactly as the per-row hash does."""
+        df = pd.concat([sample_jobs_df, sample_jobs_df.iloc[:1]], ignore_index=True)
+        keys = _dedupe_keys(df)
+        hashes = pd.Series(
+            [_hash_row(r.title, r.company, r.description) for r in df.itertuples(index=False)]
+        )
+        assert keys.tolist() == [
+            _row_key(r.title, r.company, r.description) for r in df.itertuples(index=False)
+        ]
+        assert keys.duplicated().tolist() == hashes.duplicated().tolist()
+
 
 class TestParseCityState:
     """Tests for location parsing."""
@@ -105,6 +137,13 @@ class TestParseCityState:
         assert city == "Remote"
         assert state == ""
 
+    def test_column_matches_scalar(self):
+        """Column-wise parsing should agree with _parse_city_state, including repeats."""
+        locations = pd.Series(["Phoenix, AZ", "Denver, Colorado", "", "Remote", "Phoenix, AZ"])
+        result = _parse_city_states(locations)
+        for loc, row in zip(locations, result.itertuples(index=False)):
+            assert (row.city, row.state) == _parse_city_state(loc)
+
 
 class TestCleanAndDedupe:
     """Integration tests for the full cleaning pipeline."""
@@ -118,6 +157,18 @@ class TestCleanAndDedupe:
         cleaned = clean_and_dedupe(df)
         assert len(cleaned) == 3  # Duplicate removed
 
+    def test_content_dedupe_skips_rows_dropped_by_url(self, sample_jobs_df):
+        """A URL duplicate should not shadow a later repost of its content."""
+        repost = sample_jobs_df.iloc[[1]].assign(job_url=sample_jobs_df.loc[0, "job_url"])
+        moved = sample_jobs_df.iloc[[1]].assign(job_url="https://example.com/job/9")
+        df = pd.concat([sample_jobs_df.iloc[[0]], repost, moved], ignore_index=True)
+
+        cleaned = clean_and_dedupe(df)
+        assert cleaned["job_url"].tolist() == [
+            "https://example.com/job/1",
+            "https://example.com/job/9",
+        ]
+
     def test_adds_expected_columns(self, sample_jobs_df):
         """Should add city, state, job_type, seniority columns."""
         cleaned = clean_and_dedupe(sample_jobs_df)
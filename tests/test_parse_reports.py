@@ -0,0 +1,135 @@
+"""
+Tests for parse_reports module.
+
+These tests cover the reports cache and the Parquet snapshot of the reports frame.
+PDF extraction is replaced by a stub, so no real PDFs or PyMuPDF are needed.
+"""
+
+import pytest
+
+from scripts import parse_reports
+
+
+@pytest.fixture
+def reports_env(tmp_path, monkeypatch):
+    """Isolated cache dirs plus a stub extractor that records each call."""
+    cache_dir = tmp_path / "cache"
+    text_dir = cache_dir / "reports_text"
+    text_dir.mkdir(parents=True)
+    monkeypatch.setattr(parse_reports, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(parse_reports, "CACHE_FILE", cache_dir / "reports_cache.json")
+    monkeypatch.setattr(parse_reports, "TEXT_DIR", text_dir)
+    monkeypatch.setattr(parse_reports, "_CACHE_STATE", {"sig": None, "data": None})
+    # Extract inline so the stub below is the one that runs
+    monkeypatch.setattr(parse_reports, "_pick_workers", lambda sizes: 0)
+
+    calls = []
+    failing = set()
+
+    def fake_extract(path):
+        calls.append(path.name)
+        if path.name in failing:
+            raise RuntimeError("corrupt PDF")
+        return f"text of {path.name}"
+
+    monkeypatch.setattr(parse_reports, "extract_text_pdf", fake_extract)
+    report_dir = tmp_path / "reports"
+    report_dir.mkdir()
+    return report_dir, cache_dir, calls, failing
+
+
+def _snapshots(cache_dir):
+    return sorted(cache_dir.glob("reports_df_*.parquet"))
+
+
+class TestReportsSnapshot:
+    """Tests for reusing the reports frame between runs."""
+
+    def test_unchanged_folder_reads_snapshot(self, reports_env):
+        """A second run over an untouched folder should not extract or read the cache."""
+        report_dir, cache_dir, calls, _ = reports_env
+        (report_dir / "a.pdf").write_bytes(b"%PDF-a")
+
+        first = parse_reports.parse_all_reports(report_dir)
+        assert calls == ["a.pdf"]
+        assert len(_snapshots(cache_dir)) == 1
+
+        second = parse_reports.parse_all_reports(report_dir)
+        assert calls == ["a.pdf"]
+        assert second.to_dict("records") == first.to_dict("records")
+        assert second.to_dict("records") == [{"report_name": "a.pdf", "text": "text of a.pdf"}]
+
+    def test_changed_file_replaces_snapshot(self, reports_env):
+        """Modifying a PDF should miss the snapshot and leave only the new one behind."""
+        report_dir, cache_dir, calls, _ = reports_env
+        pdf = report_dir / "a.pdf"
+        pdf.write_bytes(b"%PDF-a")
+        parse_reports.parse_all_reports(report_dir)
+        old = _snapshots(cache_dir)
+
+        pdf.write_bytes(b"%PDF-a, revised")
+        df = parse_reports.parse_all_reports(report_dir)
+        assert calls == ["a.pdf", "a.pdf"]
+        assert list(df["report_name"]) == ["a.pdf"]
+        new = _snapshots(cache_dir)
+        assert len(new) == 1 and new != old
+
+    def test_failed_pdf_is_retried(self, reports_env):
+        """A PDF that failed to extract should be retried on the next run."""
+        report_dir, cache_dir, calls, failing = reports_env
+        (report_dir / "bad.pdf").write_bytes(b"%PDF-bad")
+        failing.add("bad.pdf")
+
+        assert parse_reports.parse_all_reports(report_dir).empty
+        assert _snapshots(cache_dir) == []
+
+        failing.clear()
+        df = parse_reports.parse_all_reports(report_dir)
+        assert calls == ["bad.pdf", "bad.pdf"]
+        assert list(df["text"]) == ["text of bad.pdf"]
+
+    def test_blob_write_failure_skips_only_that_pdf(self, reports_env, monkeypatch):
+        """A failed text blob write should drop that PDF, not abort the run."""
+        report_dir, cache_dir, calls, _ = reports_env
+        (report_dir / "a.pdf").write_bytes(b"%PDF-a")
+        (report_dir / "b.pdf").write_bytes(b"%PDF-b")
+        write_text_file = parse_reports._write_text_file
+
+        def flaky_write(text, checksum):
+            if text == "text of b.pdf":
+                raise OSError("No space left on device")
+            return write_text_file(text, checksum)
+
+        monkeypatch.setattr(parse_reports, "_write_text_file", flaky_write)
+        df = parse_reports.parse_all_reports(report_dir)
+        assert list(df["report_name"]) == ["a.pdf"]
+        assert _snapshots(cache_dir) == []
+        # a.pdf's extraction was persisted; only b.pdf is extracted again
+        monkeypatch.setattr(parse_reports, "_write_text_file", write_text_file)
+        df = parse_reports.parse_all_reports(report_dir)
+        assert sorted(df["report_name"]) == ["a.pdf", "b.pdf"]
+        assert sorted(calls) == ["a.pdf", "b.pdf", "b.pdf"]
+
+
+class TestWriteTextFile:
+    """Tests for the content-addressed text blobs."""
+
+    def test_interrupted_write_leaves_no_blob(self, reports_env, monkeypatch):
+        """A write that fails before the rename should leave neither blob nor temp file."""
+        _, cache_dir, _, _ = reports_env
+
+        def fail_replace(src, dst):
+            raise OSError("interrupted")
+
+        monkeypatch.setattr(parse_reports.os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            parse_reports._write_text_file("partial", "abc123")
+        assert list((cache_dir / "reports_text").iterdir()) == []
+
+    def test_writes_blob_under_checksum(self, reports_env):
+        """A completed write should land under <checksum>.txt only."""
+        _, cache_dir, _, _ = reports_env
+        assert parse_reports._write_text_file("full text", "abc123") == "abc123.txt"
+        text_dir = cache_dir / "reports_text"
+        assert [p.name for p in text_dir.iterdir()] == ["abc123.txt"]
+        assert (text_dir / "abc123.txt").read_text(encoding="utf-8") == "full text"
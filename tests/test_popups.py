@@ -0,0 +1,43 @@
+"""
+Tests for popups module.
+
+These tests verify that map popup HTML is escaped and only links http(s) URLs.
+"""
+
+import pandas as pd
+
+from scripts.popups import popup_html
+
+
+class TestPopupHtml:
+    """Tests for popup HTML generation."""
+
+    def test_escapes_user_content(self):
+        """Titles, companies and skills should be HTML-escaped."""
+        df = pd.DataFrame({
+            "title": ["<script>x</script>"],
+            "company": ["A & B"],
+            "skills": ["GIS;<i>NEPA</i>"],
+        })
+        assert popup_html(df).iloc[0] == (
+            "<b>&lt;script&gt;x&lt;/script&gt;</b><br>A &amp; B<br>GIS, &lt;i&gt;NEPA&lt;/i&gt;"
+        )
+
+    def test_prefers_skills_list_and_caps_at_five(self):
+        """Parsed skill lists should win over the joined text, top five only."""
+        df = pd.DataFrame({
+            "title": ["Tech"],
+            "skills": ["ignored"],
+            "skills_list": [["a", "b", "c", "d", "e", "f"]],
+        })
+        assert popup_html(df).iloc[0] == "<b>Tech</b><br>a, b, c, d, e"
+
+    def test_only_http_links(self):
+        """Non-http(s) URLs should not be rendered as links."""
+        df = pd.DataFrame({
+            "title": ["A", "B"],
+            "url": ["https://example.com/job?a=1&b=2", "javascript:alert(1)"],
+        })
+        popups = popup_html(df)
+        assert 'href="https://example.com/job?a=1&amp;b=2"' in popups.iloc[0]
+        assert "href" not in popups.iloc[1]
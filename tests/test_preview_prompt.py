@@ -0,0 +1,35 @@
+"""
+Tests for preview_prompt module.
+
+These tests verify which processed jobs file the prompt preview reads.
+"""
+
+import pandas as pd
+
+from scripts.preview_prompt import ANALYSIS_COLUMNS, _read_jobs
+
+
+class TestReadJobs:
+    """Tests for loading processed jobs."""
+
+    def test_prefers_parquet_and_prunes_columns(self, tmp_path):
+        """Parquet should win over CSV and only the analysis columns should load."""
+        pd.DataFrame({
+            "company": ["A"], "skills": ["GIS"], "title": ["Tech"], "popup_html": ["<b>x</b>"],
+        }).to_parquet(tmp_path / "jobs.parquet", index=False)
+        pd.DataFrame({"company": ["from csv"]}).to_csv(tmp_path / "jobs.csv", index=False)
+
+        jobs = _read_jobs(tmp_path)
+        assert list(jobs.columns) == ["company", "skills"]
+        assert set(jobs.columns) <= set(ANALYSIS_COLUMNS)
+        assert jobs["company"].tolist() == ["A"]
+
+    def test_falls_back_to_csv(self, tmp_path):
+        """Older runs without jobs.parquet should still load from CSV."""
+        pd.DataFrame({"company": ["A"], "title": ["Tech"]}).to_csv(tmp_path / "jobs.csv", index=False)
+        jobs = _read_jobs(tmp_path)
+        assert jobs.to_dict("records") == [{"company": "A", "title": "Tech"}]
+
+    def test_missing_files(self, tmp_path):
+        """No processed output should return None."""
+        assert _read_jobs(tmp_path) is None
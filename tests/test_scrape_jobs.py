@@ -0,0 +1,179 @@
+"""
+Tests for scrape_jobs module.
+
+These tests cover the on-disk description cache and run without network access.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts import scrape_jobs
+
+
+@pytest.fixture
+def desc_cache(tmp_path, monkeypatch):
+    """Point the description cache at tmp_path and reset its in-memory state."""
+    log_path = tmp_path / "job_descriptions.jsonl"
+    monkeypatch.setattr(scrape_jobs, "DESC_CACHE_PATH", log_path)
+    monkeypatch.setattr(scrape_jobs, "LEGACY_DESC_CACHE_PATH", tmp_path / "job_descriptions.json")
+    monkeypatch.setattr(scrape_jobs, "_DESC_CACHE", None)
+    monkeypatch.setattr(scrape_jobs, "_DESC_LOG_LINES", 0)
+    return log_path
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestDescriptionCache:
+    """Tests for the append-only description log."""
+
+    def test_store_appends_and_reloads(self, desc_cache):
+        """Stored descriptions should survive a reload from disk."""
+        scrape_jobs._store_desc("https://example.com/1", "first")
+        scrape_jobs._store_desc("https://example.com/2", "second")
+        assert len(_records(desc_cache)) == 2
+
+        cache, lines = scrape_jobs._read_desc_log()
+        assert cache == {"https://example.com/1": "first", "https://example.com/2": "second"}
+        assert lines == 2
+
+    def test_last_record_wins(self, desc_cache):
+        """A later record for the same URL should replace the earlier one."""
+        scrape_jobs._store_desc("https://example.com/1", "old")
+        scrape_jobs._store_desc("https://example.com/1", "new")
+        cache, _ = scrape_jobs._read_desc_log()
+        assert cache == {"https://example.com/1": "new"}
+
+    def test_skips_malformed_lines(self, desc_cache):
+        """Corrupt or incomplete lines should be ignored, not abort the load."""
+        desc_cache.write_text(
+            'not json\n{"url": "https://example.com/1"}\n'
+            '{"url": "https://example.com/2", "text": "ok"}\n',
+            encoding="utf-8",
+        )
+        cache, lines = scrape_jobs._read_desc_log()
+        assert cache == {"https://example.com/2": "ok"}
+        assert lines == 3
+
+    def test_compacts_superseded_records(self, desc_cache):
+        """Saving should rewrite the log once superseded records dominate it."""
+        for i in range(3):
+            scrape_jobs._store_desc("https://example.com/1", f"v{i}")
+        scrape_jobs._save_desc_cache()
+        assert _records(desc_cache) == [{"url": "https://example.com/1", "text": "v2"}]
+
+    def test_no_compaction_when_mostly_live(self, desc_cache):
+        """A log without superseded records should be left untouched."""
+        scrape_jobs._store_desc("https://example.com/1", "a")
+        scrape_jobs._store_desc("https://example.com/2", "b")
+        before = desc_cache.stat().st_mtime_ns
+        scrape_jobs._save_desc_cache()
+        assert desc_cache.stat().st_mtime_ns == before
+
+    def test_migrates_legacy_json_once(self, desc_cache):
+        """The old single-blob cache should be written to the log on first load, then ignored."""
+        legacy = {"https://example.com/1": "legacy text"}
+        scrape_jobs.LEGACY_DESC_CACHE_PATH.write_text(json.dumps(legacy), encoding="utf-8")
+
+        assert scrape_jobs._load_desc_cache() == legacy
+        assert _records(desc_cache) == [{"url": "https://example.com/1", "text": "legacy text"}]
+        assert scrape_jobs._DESC_LOG_LINES == 1
+
+        scrape_jobs.LEGACY_DESC_CACHE_PATH.write_text(json.dumps({"x": "y"}), encoding="utf-8")
+        cache, lines = scrape_jobs._read_desc_log()
+        assert cache == legacy
+        assert lines == 1
+
+    def test_oversized_log_is_reset(self, desc_cache, monkeypatch):
+        """A log over the size cap should be discarded so it cannot grow without bound."""
+        monkeypatch.setattr(scrape_jobs, "_MAX_DESC_CACHE_BYTES", 1_000)
+        stale = scrape_jobs._desc_record("https://example.com/old", "x" * 100)
+        desc_cache.write_text(stale * 20, encoding="utf-8")
+
+        assert scrape_jobs._load_desc_cache() == {}
+        scrape_jobs._store_desc("https://example.com/new", "fresh")
+        scrape_jobs._save_desc_cache()
+
+        assert desc_cache.stat().st_size < 1_000
+        assert _records(desc_cache) == [{"url": "https://example.com/new", "text": "fresh"}]
+
+
+DESC_PAGE = """<html><head><script>var a = 1;</script></head><body><nav>Menu</nav>
+<article><h1>Field Tech</h1><script>track()</script><style>p { color: red }</style>
+<template>tpl</template><p>Dig  <b>sites</b></p></article></body></html>"""
+
+
+class TestDescText:
+    """Tests for description text extraction."""
+
+    def test_skips_script_and_style(self, monkeypatch):
+        """Only visible container text should be returned, on either parser."""
+        expected = "Field Tech Dig sites"
+        assert scrape_jobs._desc_text(DESC_PAGE) == expected
+        monkeypatch.setattr(scrape_jobs, "HAS_SELECTOLAX", False)
+        assert scrape_jobs._desc_text(DESC_PAGE) == expected
+
+    def test_backends_agree_without_container(self, monkeypatch):
+        """Whole-page fallback should match BeautifulSoup's get_text."""
+        page = "<body><p>Hello</p><script>x()</script><p> world </p></body>"
+        fast = scrape_jobs._desc_text(page)
+        monkeypatch.setattr(scrape_jobs, "HAS_SELECTOLAX", False)
+        assert fast == scrape_jobs._desc_text(page) == "Hello world"
+
+
+@pytest.fixture
+def token_bucket(monkeypatch):
+    """A full bucket of two tokens refilled at 50 per second."""
+    monkeypatch.setattr(scrape_jobs, "MAX_WORKERS", 2)
+    monkeypatch.setattr(scrape_jobs, "REFILL_RATE", 50.0)
+    monkeypatch.setattr(scrape_jobs, "_tokens", 2.0)
+    monkeypatch.setattr(scrape_jobs, "_last_refill", time.monotonic())
+
+
+class TestAcquireSlot:
+    """Tests for the request rate limiter."""
+
+    def test_burst_then_waits_for_next_token(self, token_bucket):
+        """A full bucket should serve MAX_WORKERS at once, then wait about one refill."""
+        start = time.monotonic()
+        scrape_jobs._acquire_slot()
+        scrape_jobs._acquire_slot()
+        assert time.monotonic() - start < 0.015
+
+        start = time.monotonic()
+        scrape_jobs._acquire_slot()
+        waited = time.monotonic() - start
+        assert 0.015 <= waited < 0.2
+
+    def test_concurrent_callers_share_the_rate(self, token_bucket):
+        """Threads waiting on the condition should all get a slot, at the refill rate."""
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda _: scrape_jobs._acquire_slot(), range(6)))
+        # Two tokens up front, four more at 50 per second
+        assert 0.07 <= time.monotonic() - start < 1.0
+
+
+class TestSession:
+    """Tests for the shared HTTP session."""
+
+    def test_one_pooled_session_across_threads(self, monkeypatch):
+        """Threads racing on the first call should all get one session sized for MAX_WORKERS."""
+        monkeypatch.setattr(scrape_jobs, "MAX_WORKERS", 8)
+        monkeypatch.setattr(scrape_jobs, "_SESSION", None)
+        start = threading.Barrier(8)
+
+        def first_call(_):
+            start.wait()
+            return scrape_jobs._session()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            sessions = list(pool.map(first_call, range(8)))
+        assert all(s is sessions[0] for s in sessions)
+        adapter = sessions[0].get_adapter("https://example.com/")
+        assert adapter._pool_maxsize == 16